@@ -0,0 +1,13 @@
+# Gunicorn settings for the backend: `gunicorn -c gunicorn.conf.py server:app` from /app/backend
+import multiprocessing
+import os
+
+bind = "0.0.0.0:8001"
+worker_class = "uvicorn.workers.UvicornWorker"
+# One process per core (plus spare) so request handling is not serialized on a single GIL
+workers = int(os.getenv("WEB_CONCURRENCY", 2 * multiprocessing.cpu_count() + 1))
+# workers inherit this, so server.py knows it is not alone and skips its per-process list cache
+os.environ["WEB_CONCURRENCY"] = str(workers)
+keepalive = 5
+# LLM replies can take a while; keep the worker timeout above the slowest chat turn
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
@@ -1,7 +1,26 @@
+import threading
+from typing import Optional
 from .llm_adapter import LLMAdapter
 from .openai_client import OpenAIClient
 
+# One client per process so the underlying HTTP connection pool is reused
+_CLIENT: Optional[LLMAdapter] = None
+_CLIENT_LOCK = threading.Lock()
+
 
 def get_llm_client() -> LLMAdapter:
     # Future: switch based on env (e.g., PROVIDER=anthropic/gemini)
-    return OpenAIClient()
\ No newline at end of file
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = OpenAIClient()
+    return _CLIENT
+
+
+async def close_llm_client() -> None:
+    global _CLIENT
+    with _CLIENT_LOCK:
+        client, _CLIENT = _CLIENT, None
+    if client is not None:
+        await client.close()
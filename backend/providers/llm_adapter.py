@@ -1,9 +1,44 @@
-from typing import List, Dict, Any
+import asyncio
+from typing import List, Dict, Any, AsyncIterator
+import orjson
 
 class LLMAdapter:
-    def list_models(self) -> List[Dict[str, Any]]:
+    async def list_models(self) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
-    def chat(self, model_id: str, messages: List[Dict[str, str]], temperature: float = 0.3, max_tokens: int = 800) -> Dict[str, Any]:
+    async def list_models_json(self) -> bytes:
+        # Serialized list_models(); providers with a catalog cache can return stored bytes
+        return orjson.dumps(await self.list_models())
+
+    async def chat(self, model_id: str, messages: List[Dict[str, str]], temperature: float = 0.3, max_tokens: int = 800, n: int = 1) -> Dict[str, Any]:
         # Return dict with keys: text, tokens_in, tokens_out, latency_ms, provider, model_id
-        raise NotImplementedError
\ No newline at end of file
+        # (plus texts, one per completion, when n > 1)
+        raise NotImplementedError
+
+    def chat_stream(self, model_id: str, messages: List[Dict[str, str]], temperature: float = 0.3, max_tokens: int = 800) -> AsyncIterator[str]:
+        # Async iterator of text deltas as the completion is generated
+        raise NotImplementedError
+
+    async def chat_many(self, model_id: str, batched_messages: List[List[Dict[str, str]]], temperature: float = 0.3, max_tokens: int = 800, concurrency: int = 10) -> List[Dict[str, Any]]:
+        # Issue independent chats concurrently; the semaphore keeps us inside provider rate limits.
+        # Results are returned in the same order as batched_messages.
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(messages: List[Dict[str, str]]) -> Dict[str, Any]:
+            async with sem:
+                return await self.chat(model_id, messages, temperature, max_tokens)
+
+        return await asyncio.gather(*(one(m) for m in batched_messages))
+
+    async def submit_batch(self, model_id: str, batched_messages: List[List[Dict[str, str]]], temperature: float = 0.3, max_tokens: int = 800) -> str:
+        # Queue latency-tolerant chats on the provider's batch endpoint; returns a batch id
+        raise NotImplementedError
+
+    async def fetch_batch(self, batch_id: str) -> Dict[str, Any]:
+        # Return dict with keys: status, results (list shaped like chat(), or None until complete),
+        # errors (per-request failures with their submission index)
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        # Release pooled connections; providers without a transport can ignore this
+        pass
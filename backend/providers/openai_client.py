@@ -1,46 +1,176 @@
+import asyncio
 import os
 import time
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+import httpx
+import orjson
+from openai import AsyncOpenAI
 from .llm_adapter import LLMAdapter
 
+# Shared by every catalog entry; a tuple so no entry can mutate it for the others
+_CAPABILITIES: Tuple[str, ...] = ("chat",)
+
+# Model catalog changes rarely; cache it as (fetched_at, models, models_json)
+_MODELS_CACHE: Optional[Tuple[float, List[Dict[str, Any]], bytes]] = None
+_MODELS_TTL = int(os.getenv("MODELS_TTL", "300"))
+_MODELS_LOCK = asyncio.Lock()
+
+# expired and cancelled batches can still carry partial output, so all of these are collected
+_BATCH_TERMINAL = ("completed", "failed", "expired", "cancelled")
+
 class OpenAIClient(LLMAdapter):
     def __init__(self):
         key = os.getenv("OPENAI_API_KEY")
         if not key:
             raise RuntimeError("OPENAI_API_KEY is not set")
+        # Explicit transport: pooled keep-alive connections and bounded timeouts
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0),
+            timeout=httpx.Timeout(connect=10.0, read=60.0, write=30.0, pool=10.0),
+            http2=True,
+        )
         # OpenAI client will read api_key parameter
-        self._client = OpenAI(api_key=key)
-
-    def list_models(self) -> List[Dict[str, Any]]:
-        out: List[Dict[str, Any]] = []
-        models = self._client.models.list().data
-        for m in models:
-            out.append({
-                "id": getattr(m, "id", None),
+        self._client = AsyncOpenAI(api_key=key, http_client=self._http)
+
+    async def close(self) -> None:
+        await self._http.aclose()
+
+    async def list_models(self) -> List[Dict[str, Any]]:
+        return (await self._cached_models())[1]
+
+    async def list_models_json(self) -> bytes:
+        return (await self._cached_models())[2]
+
+    async def _cached_models(self) -> Tuple[float, List[Dict[str, Any]], bytes]:
+        global _MODELS_CACHE
+        cached = _MODELS_CACHE
+        if cached and time.monotonic() - cached[0] < _MODELS_TTL:
+            return cached
+        async with _MODELS_LOCK:
+            # Another caller may have refreshed while we waited
+            cached = _MODELS_CACHE
+            if cached and time.monotonic() - cached[0] < _MODELS_TTL:
+                return cached
+            models = await self._fetch_models()
+            _MODELS_CACHE = (time.monotonic(), models, orjson.dumps(models))
+            return _MODELS_CACHE
+
+    async def _fetch_models(self) -> List[Dict[str, Any]]:
+        models = (await self._client.models.list()).data
+        return [
+            {
+                "id": m.id,
                 "provider": "openai",
                 # OpenAI python objects may not expose context_window; leave None if missing
                 "context_window": getattr(m, "context_window", None),
-                "capabilities": ["chat"],
-            })
-        return out
+                "capabilities": _CAPABILITIES,
+            }
+            for m in models
+        ]
 
-    def chat(self, model_id: str, messages: List[Dict[str, str]], temperature: float = 0.3, max_tokens: int = 800) -> Dict[str, Any]:
-        t0 = time.time()
-        resp = self._client.chat.completions.create(
+    async def chat(self, model_id: str, messages: List[Dict[str, str]], temperature: float = 0.3, max_tokens: int = 800, n: int = 1) -> Dict[str, Any]:
+        t0 = time.perf_counter_ns()
+        resp = await self._client.chat.completions.create(
             model=model_id,
             messages=messages,
             temperature=temperature,
             max_tokens=max_tokens,
+            n=n,
         )
-        t1 = time.time()
-        choice = resp.choices[0].message
-        usage = getattr(resp, "usage", None)
-        return {
-            "text": getattr(choice, "content", ""),
-            "tokens_in": getattr(usage, "prompt_tokens", None) if usage else None,
-            "tokens_out": getattr(usage, "completion_tokens", None) if usage else None,
-            "latency_ms": int((t1 - t0) * 1000),
+        latency_ms = (time.perf_counter_ns() - t0) // 1_000_000
+        usage = resp.usage
+        out = {
+            "text": resp.choices[0].message.content or "",
+            "tokens_in": usage.prompt_tokens if usage else None,
+            "tokens_out": usage.completion_tokens if usage else None,
+            "latency_ms": latency_ms,
             "provider": "openai",
             "model_id": model_id,
-        }
\ No newline at end of file
+        }
+        if n > 1:
+            # One request, K samples: the prompt is tokenized and billed once
+            out["texts"] = [c.message.content or "" for c in resp.choices]
+        return out
+
+    async def chat_stream(self, model_id: str, messages: List[Dict[str, str]], temperature: float = 0.3, max_tokens: int = 800) -> AsyncIterator[str]:
+        stream = await self._client.chat.completions.create(
+            model=model_id,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    async def submit_batch(self, model_id: str, batched_messages: List[List[Dict[str, str]]], temperature: float = 0.3, max_tokens: int = 800) -> str:
+        # Batch API: one JSONL line per request, results within the 24h window at reduced cost
+        lines = [
+            orjson.dumps({
+                "custom_id": f"req-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": model_id, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            })
+            for i, messages in enumerate(batched_messages)
+        ]
+        upload = await self._client.files.create(file=("batch.jsonl", b"\n".join(lines)), purpose="batch")
+        batch = await self._client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+            # request_counts can be absent; fetch_batch sizes results from this instead
+            metadata={"request_count": str(len(batched_messages))},
+        )
+        return batch.id
+
+    async def _batch_rows(self, file_id: Optional[str]) -> List[Dict[str, Any]]:
+        if not file_id:
+            return []
+        content = await self._client.files.content(file_id)
+        return [orjson.loads(line) for line in content.read().splitlines() if line.strip()]
+
+    async def fetch_batch(self, batch_id: str) -> Dict[str, Any]:
+        # Returns {"status", "results", "errors"}; results is None until the batch reaches a terminal
+        # status, then a list in submission order shaped like chat() (None for failed or unfinished
+        # requests). errors lists {"index", "custom_id", "error"} for every failed request.
+        batch = await self._client.batches.retrieve(batch_id)
+        if batch.status not in _BATCH_TERMINAL:
+            return {"status": batch.status, "results": None, "errors": []}
+        output_rows, error_rows = await asyncio.gather(
+            self._batch_rows(batch.output_file_id), self._batch_rows(batch.error_file_id),
+        )
+        results: Dict[int, Dict[str, Any]] = {}
+        errors: List[Dict[str, Any]] = []
+        for row in output_rows + error_rows:
+            index = int(row["custom_id"].split("-", 1)[1])
+            response = row.get("response") or {}
+            if response.get("status_code") != 200:
+                err = row.get("error") or (response.get("body") or {}).get("error") or {}
+                message = err.get("message") or err.get("code") or f"status {response.get('status_code')}"
+                errors.append({"index": index, "custom_id": row["custom_id"], "error": message})
+                continue
+            body = response["body"]
+            usage = body.get("usage") or {}
+            results[index] = {
+                "text": body["choices"][0]["message"].get("content") or "",
+                "tokens_in": usage.get("prompt_tokens"),
+                "tokens_out": usage.get("completion_tokens"),
+                "latency_ms": None,
+                "provider": "openai",
+                "model_id": body.get("model"),
+            }
+        errors.sort(key=lambda e: e["index"])
+        # size by what was submitted, so failed requests keep their slot instead of shifting later ones
+        submitted = (batch.metadata or {}).get("request_count")
+        if submitted:
+            total = int(submitted)
+        elif batch.request_counts:
+            total = batch.request_counts.total
+        else:
+            total = 1 + max([*results, *(e["index"] for e in errors)], default=-1)
+        return {"status": batch.status, "results": [results.get(i) for i in range(total)], "errors": errors}
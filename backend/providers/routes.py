@@ -1,20 +1,88 @@
-from fastapi import APIRouter
-from .factory import get_llm_client
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+import asyncio
+import logging
+import orjson
+from .factory import get_llm_client, close_llm_client
 from .selector import select_praefectus_default_model
-from typing import Dict, Any
+from typing import Dict, List, Optional
 
 # Import server helpers to ensure events are logged centrally
-from server import now_iso, log_event  # type: ignore
+from server import now_iso, log_event, LLM_SEMAPHORE  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/providers", tags=["providers"], default_response_class=ORJSONResponse)
+
+# Bound on the background prewarm; a slow provider just leaves the first chat turn to do the work
+PREWARM_TIMEOUT = 5
+_prewarm_task: Optional[asyncio.Task] = None
+
+async def _prewarm():
+    # Open the pooled TLS connection before user traffic arrives, and resolve the default model
+    # from the now-cached catalog so the first chat turn skips the selection pass
+    async def warm():
+        await get_llm_client().list_models()
+        await select_praefectus_default_model()
+    try:
+        await asyncio.wait_for(warm(), timeout=PREWARM_TIMEOUT)
+    except Exception as e:
+        logger.warning("LLM client prewarm failed: %r", e)
+
+@router.on_event("startup")
+async def _prewarm_llm_client():
+    # In the background, so worker boot never waits on the provider being reachable
+    global _prewarm_task
+    _prewarm_task = asyncio.create_task(_prewarm())
+
+@router.on_event("shutdown")
+async def _close_llm_client():
+    if _prewarm_task:
+        _prewarm_task.cancel()
+    await close_llm_client()
 
-router = APIRouter(prefix="/api/providers", tags=["providers"])
 @router.get("/models")
 async def list_models():
     client = get_llm_client()
-    models = client.list_models()
-    return {"models": models, "timestamp": now_iso()}
+    models_json = await client.list_models_json()
+    # Splice the cached catalog bytes instead of re-encoding the list per request
+    body = b'{"models":' + models_json + b',"timestamp":"' + now_iso().encode() + b'"}'
+    return Response(content=body, media_type="application/json")
 
 @router.get("/health")
 async def health():
-    model_id = select_praefectus_default_model()
+    model_id = await select_praefectus_default_model()
     await log_event("provider_selected_default", "backend/providers", {"provider": "openai", "model_id": model_id})
-    return {"provider": "openai", "praefectus_model_id": model_id, "timestamp": now_iso()}
\ No newline at end of file
+    return {"provider": "openai", "praefectus_model_id": model_id, "timestamp": now_iso()}
+
+class ProviderChatInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+    model_id: Optional[str] = None
+    messages: List[Dict[str, str]] = Field(min_length=1, max_length=100)
+    temperature: float = Field(default=0.3, ge=0.0, le=2.0)
+    max_tokens: int = Field(default=800, ge=1, le=4096)
+
+@router.post("/chat/stream")
+async def chat_stream(payload: ProviderChatInput):
+    client = get_llm_client()
+    default_model = await select_praefectus_default_model()
+    model_id = payload.model_id or default_model
+    if model_id != default_model:
+        # only models the provider catalog offers (the same cached list the selector picks from)
+        if model_id not in {m.get("id") for m in await client.list_models()}:
+            raise HTTPException(status_code=400, detail=f"Unknown model_id: {model_id}")
+
+    async def events():
+        # Server-sent events: one JSON-encoded text delta per event, then [DONE]
+        try:
+            async with LLM_SEMAPHORE:
+                async for delta in client.chat_stream(model_id, payload.messages, payload.temperature, payload.max_tokens):
+                    yield b"data: " + orjson.dumps(delta) + b"\n\n"
+        except Exception as e:
+            # headers are already sent, so report the failure in-band
+            yield b"data: " + orjson.dumps({"error": f"LLM error: {e}"}) + b"\n\n"
+            return
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,44 +1,61 @@
+import asyncio
 import os
 import time
-from typing import Optional
+from typing import Optional, Tuple
 from .factory import get_llm_client
 
-_DEFAULT_MODEL_CACHE: Optional[str] = None
-_LAST_SELECT_AT = 0
+# (hour bucket, model id): the selection expires when the monotonic hour rolls over
+_SELECT_TTL = 3600
+_SELECTED: Optional[Tuple[int, str]] = None
+_SELECT_LOCK = asyncio.Lock()
 
+# Read once at import; server.py loads .env before importing providers
+_CFG_MODEL = os.getenv("PRAEFECTUS_MODEL_ID", "auto")
 
-def select_praefectus_default_model() -> str:
-    global _DEFAULT_MODEL_CACHE, _LAST_SELECT_AT
-    if _DEFAULT_MODEL_CACHE and (time.time() - _LAST_SELECT_AT) < 3600:
-        return _DEFAULT_MODEL_CACHE
+_FAMILY = "gpt-5"
+_REASON, _THINK, _CHAT = "reason", "think", "chat"
 
-    client = get_llm_client()
-    cfg = os.getenv("PRAEFECTUS_MODEL_ID", "auto")
-    if cfg and cfg != "auto":
-        _DEFAULT_MODEL_CACHE = cfg
-        _LAST_SELECT_AT = time.time()
-        return cfg
 
-    # Auto-select: prefer GPT-5 reasoning/thinking chat models; else best GPT-5 chat
+async def select_praefectus_default_model() -> str:
+    # An explicit model needs neither the cache nor a provider client
+    if _CFG_MODEL and _CFG_MODEL != "auto":
+        return _CFG_MODEL
+    global _SELECTED
+    bucket = int(time.monotonic() // _SELECT_TTL)
+    cached = _SELECTED
+    if cached and cached[0] == bucket:
+        return cached[1]
+    async with _SELECT_LOCK:
+        # Re-check: a concurrent caller may have refreshed while we waited
+        cached = _SELECTED
+        if cached and cached[0] == bucket:
+            return cached[1]
+        model_id = await _select_best_model()
+        _SELECTED = (bucket, model_id)
+        return model_id
+
+
+async def _select_best_model() -> str:
+    client = get_llm_client()
+    # Auto-select in one pass: GPT-5 reasoning/thinking > GPT-5 chat > any GPT-5 > first available
     best = None
-    models = client.list_models()
-    # Prefer reasoning/thinking variants
+    best_rank = -1
+    models = await client.list_models()
     for m in models:
         mid = str(m.get("id", "")).lower()
-        if "gpt-5" in mid and ("reason" in mid or "think" in mid):
+        if _FAMILY in mid:
+            if _REASON in mid or _THINK in mid:
+                rank = 3
+            elif _CHAT in mid:
+                rank = 2
+            else:
+                rank = 1
+        else:
+            rank = 0
+        if rank > best_rank:
             best = m.get("id")
-            break
-    # Next, pick GPT-5 chat
-    if not best:
-        for m in models:
-            mid = str(m.get("id", "")).lower()
-            if "gpt-5" in mid and "chat" in mid:
-                best = m.get("id")
+            best_rank = rank
+            if rank == 3:
                 break
-    # Fallback to first available
-    if not best and models:
-        best = models[0].get("id")
 
-    _DEFAULT_MODEL_CACHE = best or "gpt-5"
-    _LAST_SELECT_AT = time.time()
-    return _DEFAULT_MODEL_CACHE
\ No newline at end of file
+    return best or "gpt-5"
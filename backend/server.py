@@ -1,52 +1,87 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.background import BackgroundTask
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 from zoneinfo import ZoneInfo
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 import os
 import uuid
 import csv
-import io
+import hashlib
 import asyncio
+import logging
+import time
+import orjson
+import aiohttp
 
 # Load env
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / ".env")
 
+# Motor runs pymongo calls on a thread pool sized from MOTOR_MAX_WORKERS when motor is first imported,
+# so the default must be in place (after .env is loaded) before that import. Motor's own default is
+# 5 threads per core; only raise it, to at least 32, so small-core hosts can still overlap the several
+# queries a gathered handler fans out. Never shrink it below what larger hosts already get.
+os.environ.setdefault("MOTOR_MAX_WORKERS", str(max(32, (os.cpu_count() or 1) * 5)))
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
 # MongoDB
 mongo_url = os.environ["MONGO_URL"]
-client = AsyncIOMotorClient(mongo_url)
+# One client per process (each uvicorn worker imports this module once), with a warm, bounded pool
+client = AsyncIOMotorClient(
+    mongo_url,
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "200")),
+    minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "20")),
+    serverSelectionTimeoutMS=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "3000")),
+)
 db = client[os.environ["DB_NAME"]]
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 api = APIRouter(prefix="/api")
 
 PHOENIX_TZ = ZoneInfo("America/Phoenix")
+UTC_TZ = ZoneInfo("UTC")
+# Arizona observes no DST, so a fixed -07:00 offset formats identically without the zoneinfo transition lookup
+PHOENIX_OFFSET = timezone(timedelta(hours=-7))
 
 def now_iso() -> str:
-    return datetime.now(tz=PHOENIX_TZ).isoformat()
+    return datetime.now(tz=PHOENIX_OFFSET).isoformat()
+
+@lru_cache(maxsize=8192)
+def _to_phoenix_cached(ts: str) -> str:
+    # Pure for a given string, and list payloads repeat timestamps, so memoize the parse
+    s = ts.replace("Z", "+00:00")
+    dt = datetime.fromisoformat(s)
+    if not dt.tzinfo:
+        # assume UTC if missing tz
+        dt = dt.replace(tzinfo=UTC_TZ)
+    return dt.astimezone(PHOENIX_OFFSET).isoformat()
 
 def to_phoenix(ts: Optional[str]) -> Optional[str]:
     if not ts:
         return ts
+    # Everything this app writes is already Phoenix ISO (now_iso / $$NOW): nothing to parse or convert
+    if isinstance(ts, str) and len(ts) in (25, 32) and ts[10] == "T" and ts.endswith("-07:00"):
+        return ts
     try:
-        s = ts.replace("Z", "+00:00")
-        dt = datetime.fromisoformat(s)
-        if not dt.tzinfo:
-            # assume UTC if missing tz
-            dt = dt.replace(tzinfo=ZoneInfo("UTC"))
-        return dt.astimezone(PHOENIX_TZ).isoformat()
+        return _to_phoenix_cached(ts)
     except Exception:
         return now_iso()
 
 # UUID
 
 def new_id() -> str:
-    return str(uuid.uuid4())
+    # 32-char hex skips the dashed formatter; ids are opaque strings, so legacy dashed ids stay valid
+    return uuid.uuid4().hex
 
 # Collections
 COLL_CAMPAIGNS = db["Missions"]
@@ -61,48 +96,165 @@ COLL_FORUMS = db["Forums"]
 COLL_ROLODEX = db["Rolodex"]
 COLL_HOT_LEADS = db["Hot Leads"]
 
+# Response cache for hot list endpoints. Every write through the helpers below bumps a
+# per-collection version, which invalidates cached bodies. The versions are per process, so a
+# write through another worker would not be seen: the cache is only on for a single worker.
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "5")) if int(os.getenv("WEB_CONCURRENCY", "1")) <= 1 else 0.0
+_coll_versions: Dict[str, int] = {}
+_response_cache: Dict[str, Tuple[int, float, bytes]] = {}
+
+def bump_version(coll):
+    _coll_versions[coll.name] = _coll_versions.get(coll.name, 0) + 1
+
+def coll_version(coll) -> int:
+    return _coll_versions.get(coll.name, 0)
+
+def cached_response(key: str, version: int) -> Optional[Response]:
+    hit = _response_cache.get(key)
+    if hit and hit[0] == version and time.monotonic() - hit[1] < RESPONSE_CACHE_TTL:
+        return Response(content=hit[2], media_type="application/json")
+    return None
+
+def cache_response(key: str, version: int, data: Any) -> Response:
+    # version must be read before the query so a concurrent write invalidates this entry
+    body = orjson.dumps(data)
+    if RESPONSE_CACHE_TTL > 0:
+        _response_cache[key] = (version, time.monotonic(), body)
+    return Response(content=body, media_type="application/json")
+
 # DB helpers (UUID only)
+def fill_missing(defaults: Dict[str, Any]) -> Dict[str, Any]:
+    # fill only absent fields (explicit nulls are kept, as with setdefault)
+    return {k: {"$cond": [{"$eq": [{"$type": f"${k}"}, "missing"]}, {"$literal": v}, f"${k}"]} for k, v in defaults.items()}
+
+async def list_shaped(coll, defaults: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+    # newest first, with _id stripped and defaults filled by the server so rows arrive in response shape
+    pipeline = [{"$sort": {"updated_at": -1}}, {"$limit": limit}]
+    if defaults:
+        pipeline.append({"$set": fill_missing(defaults)})
+    pipeline.append({"$unset": "_id"})
+    return await coll.aggregate(pipeline, batchSize=LIST_BATCH_SIZE).to_list(limit)
+
 async def insert_with_id(coll, doc: Dict[str, Any]) -> Dict[str, Any]:
     if "id" not in doc and "thread_id" not in doc:
         doc["id"] = new_id()
-    created = doc.get("created_at", now_iso())
-    doc["created_at"] = created
-    doc["updated_at"] = doc.get("updated_at", created)
-    if "_id" not in doc:
-        doc["_id"] = doc.get("id") or doc.get("thread_id")
-    await coll.insert_one(doc)
-    doc.pop("_id", None)
+    # only format a timestamp when the model did not already supply one
+    if "created_at" not in doc:
+        doc["created_at"] = now_iso()
+    if "updated_at" not in doc:
+        doc["updated_at"] = doc["created_at"]
+    # _id mirrors the public id; it goes on the stored copy only, so the returned doc never carries it
+    _id = doc.pop("_id", None) or doc.get("id") or doc.get("thread_id")
+    await coll.insert_one({"_id": _id, **doc})
+    bump_version(coll)
     return doc
 
-async def update_by_id(coll, _id: str, fields: Dict[str, Any]) -> int:
-    set_fields = {k: v for k, v in fields.items() if v is not None}
-    unset_fields = {k: "" for k, v in fields.items() if v is None}
-    set_fields["updated_at"] = now_iso()
-    upd: Dict[str, Any] = {}
-    if set_fields:
-        upd["$set"] = set_fields
+# updated_at stamped by Mongo from $$NOW, in the same Phoenix ISO shape now_iso() produces (microseconds padded from ms).
+# Only updates use it: inserts (insert_with_id, create_thread, message_doc, duplicated runs) are stamped by the app's
+# now_iso(), so updated_at mixes two clocks and list ordering between a fresh insert and a fresh update can be
+# off by however far the app and database hosts' clocks are skewed. Keep both NTP-synced.
+UPDATED_AT_NOW = {"$dateToString": {"date": "$$NOW", "format": "%Y-%m-%dT%H:%M:%S.%L000-07:00", "timezone": "-07:00"}}
+
+def _update_spec(fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Pipeline update so the timestamp is computed server-side; values are $literal so "$"-prefixed strings stay data
+    set_fields = {k: {"$literal": v} for k, v in fields.items() if v is not None}
+    set_fields["updated_at"] = UPDATED_AT_NOW
+    upd: List[Dict[str, Any]] = [{"$set": set_fields}]
+    unset_fields = [k for k, v in fields.items() if v is None]
     if unset_fields:
-        upd["$unset"] = unset_fields
-    res = await coll.update_one({"_id": _id}, upd)
+        upd.append({"$unset": unset_fields})
+    return upd
+
+async def update_by_id(coll, _id: str, fields: Dict[str, Any]) -> int:
+    res = await coll.update_one({"_id": _id}, _update_spec(fields))
+    bump_version(coll)
     return res.modified_count
 
-async def get_by_id(coll, _id: str) -> Optional[Dict[str, Any]]:
-    doc = await coll.find_one({"_id": _id})
-    if doc:
-        doc.pop("_id", None)
+async def update_and_get(coll, _id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Write and read back the updated document in one round trip; None when no document matched
+    doc = await coll.find_one_and_update({"_id": _id}, _update_spec(fields), projection={"_id": 0}, return_document=ReturnDocument.AFTER)
+    bump_version(coll)
     return doc
 
+async def get_by_id(coll, _id: str) -> Optional[Dict[str, Any]]:
+    return await coll.find_one({"_id": _id}, {"_id": 0})
+
 # Events
 class Event(BaseModel):
+    # schema reference only: log_event builds these documents directly, so skip the core-schema build
+    model_config = ConfigDict(defer_build=True)
     id: str = Field(default_factory=new_id)
     event_name: str
     source: str
     timestamp: str = Field(default_factory=now_iso)
     payload: Dict[str, Any] = Field(default_factory=dict)
 
+# Events are persisted by a background worker in batches; request paths only enqueue
+EVENT_BATCH_MAX = 500
+EVENT_FLUSH_INTERVAL = 0.1
+_event_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+_event_worker: Optional[asyncio.Task] = None
+# queued by shutdown; the worker flushes everything ahead of it and exits
+_EVENT_STOP: Dict[str, Any] = {}
+
 async def log_event(event_name: str, source: str, payload: Optional[Dict[str, Any]] = None):
-    ev = Event(event_name=event_name, source=source, payload=payload or {})
-    await insert_with_id(COLL_EVENTS, ev.model_dump())
+    # Same shape as Event.model_dump(); built directly since every caller is trusted server code
+    _id, ts = new_id(), now_iso()
+    _event_queue.put_nowait({
+        "_id": _id, "id": _id, "event_name": event_name, "source": source, "timestamp": ts,
+        "payload": payload or {}, "created_at": ts, "updated_at": ts,
+    })
+
+def _drain_events(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    while len(batch) < EVENT_BATCH_MAX and not _event_queue.empty():
+        batch.append(_event_queue.get_nowait())
+    return batch
+
+def _coalesce_events(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Within one flush window, exact repeats of the same event for the same mission/thread (double clicks,
+    # FE error storms) collapse into the first occurrence: its timestamp is kept and the repeat count recorded.
+    # Only byte-identical payloads are merged, so distinct events always keep their own record.
+    out: List[Dict[str, Any]] = []
+    seen: Dict[Tuple[str, str, bytes], Dict[str, Any]] = {}
+    for ev in batch:
+        p = ev["payload"]
+        # FE-posted payloads are arbitrary JSON, so only dicts can carry a mission/thread reference
+        ref = (p.get("campaign_id") or p.get("thread_id")) if isinstance(p, dict) else None
+        if not ref or not isinstance(ref, str):
+            out.append(ev)
+            continue
+        try:
+            key = (ev["event_name"], ev["source"], orjson.dumps(p, option=orjson.OPT_SORT_KEYS))
+        except TypeError:
+            out.append(ev)
+            continue
+        first = seen.get(key)
+        if first is None:
+            seen[key] = ev
+            out.append(ev)
+        else:
+            first["coalesced"] = first.get("coalesced", 1) + 1
+    return out
+
+async def _flush_events(batch: List[Dict[str, Any]]):
+    batch = _coalesce_events(batch)
+    try:
+        await COLL_EVENTS.insert_many(batch, ordered=False)
+    except Exception:
+        logger.exception("failed to persist %d events", len(batch))
+
+async def _run_event_worker():
+    while True:
+        batch = [await _event_queue.get()]
+        if _event_queue.qsize() < EVENT_BATCH_MAX:
+            # let a burst accumulate so it lands in one insert_many
+            await asyncio.sleep(EVENT_FLUSH_INTERVAL)
+        drained = _drain_events(batch)
+        batch = [ev for ev in drained if ev is not _EVENT_STOP]
+        if batch:
+            await _flush_events(batch)
+        if len(batch) != len(drained):
+            return
 
 @api.get("/events")
 async def list_events(source: Optional[str] = None, campaign_id: Optional[str] = None, thread_id: Optional[str] = None, limit: int = 100):
@@ -110,8 +262,11 @@ async def list_events(source: Optional[str] = None, campaign_id: Optional[str] =
     if source: q["source"] = source
     if campaign_id: q["payload.campaign_id"] = campaign_id
     if thread_id: q["payload.thread_id"] = thread_id
-    docs = await COLL_EVENTS.find(q).sort("timestamp", -1).limit(limit).to_list(limit)
-    return [{k: (to_phoenix(v) if k == "timestamp" else v) for k, v in d.items() if k != "_id"} for d in docs]
+    docs = await COLL_EVENTS.find(q, {"_id": 0}).sort("timestamp", -1).limit(limit).batch_size(limit).to_list(limit)
+    for d in docs:
+        if "timestamp" in d:
+            d["timestamp"] = to_phoenix(d["timestamp"])
+    return docs
 
 @api.post("/events")
 async def create_event(payload: Dict[str, Any]):
@@ -122,6 +277,8 @@ async def create_event(payload: Dict[str, Any]):
     return {"ok": True, "timestamp": now_iso()}
 
 # Missions
+DEFAULT_COUNTERS = {"forums_found":0, "prospects_added":0, "hot_leads":0}
+
 class Campaign(BaseModel):
     model_config = ConfigDict(extra="forbid")
     id: str = Field(default_factory=new_id)
@@ -130,7 +287,7 @@ class Campaign(BaseModel):
     posture: str
     state: str
     agents_assigned: List[str] = Field(default_factory=list)
-    counters: Dict[str, int] = Field(default_factory=lambda: {"forums_found":0, "prospects_added":0, "hot_leads":0})
+    counters: Dict[str, int] = Field(default_factory=DEFAULT_COUNTERS.copy)
     insights: List[str] = Field(default_factory=list)
     insights_rich: List[Dict[str, str]] = Field(default_factory=list)
     previous_active_state: Optional[str] = None
@@ -162,65 +319,79 @@ class CampaignUpdate(BaseModel):
 async def create_mission(payload: CampaignCreate):
     mission = Campaign(**payload.model_dump())
     if mission.insights and not mission.insights_rich:
-        mission.insights_rich = [{"text": t, "timestamp": now_iso()} for t in mission.insights]
+        ts = now_iso()
+        mission.insights_rich = [{"text": t, "timestamp": ts} for t in mission.insights]
     doc = await insert_with_id(COLL_CAMPAIGNS, mission.model_dump())
     await log_event("mission_created", "backend/api", {"campaign_id": doc["id"]})
     return doc
 
+def mission_defaults() -> Dict[str, Any]:
+    ts = now_iso()
+    return {
+        "counters": DEFAULT_COUNTERS.copy(),
+        "insights": [],
+        "insights_rich": [],
+        "previous_active_state": None,
+        "state": "draft",
+        "created_at": ts,
+        "updated_at": ts,
+    }
+
+# Cursor batch size for the large list endpoints
+LIST_BATCH_SIZE = 200
+
+# Heavy fields (and the _id the API never returns) left out of list payloads; the detail endpoints still return them
+MISSION_LIST_PROJECTION = {"_id": 0, "insights_rich": 0}
+FINDING_LIST_PROJECTION = {"_id": 0, "body_markdown": 0, "attachments": 0}
+
 @api.get("/campaigns")
 async def list_missions():
-    docs = await COLL_CAMPAIGNS.find().sort("updated_at", -1).to_list(1000)
-    out = []
-    for d in docs:
-        d.pop("_id", None)
-        # migrate-on-read defaults
-        d.setdefault("counters", {"forums_found":0, "prospects_added":0, "hot_leads":0})
-        d.setdefault("insights", [])
-        d.setdefault("insights_rich", [])
-        d.setdefault("previous_active_state", None)
-        d.setdefault("state", "draft")
-        d.setdefault("created_at", now_iso())
-        d.setdefault("updated_at", now_iso())
-        out.append(d)
-    return out
+    version = coll_version(COLL_CAMPAIGNS)
+    cached = cached_response("campaigns", version)
+    if cached:
+        return cached
+    # the whole page is serialized at once, so it is materialized either way; batch_size only sets the round-trip size
+    docs = await COLL_CAMPAIGNS.find({}, MISSION_LIST_PROJECTION).sort("updated_at", -1).batch_size(LIST_BATCH_SIZE).to_list(1000)
+    return cache_response("campaigns", version, docs)
 
 @api.get("/campaigns/{campaign_id}")
 async def get_mission(campaign_id: str):
     d = await get_by_id(COLL_CAMPAIGNS, campaign_id)
     if not d:
         raise HTTPException(status_code=404, detail="Mission not found")
-    # migrate-on-read
-    changed = False
-    if "counters" not in d: d["counters"] = {"forums_found":0, "prospects_added":0, "hot_leads":0}; changed = True
-    if "insights" not in d: d["insights"] = []; changed = True
-    if "insights_rich" not in d: d["insights_rich"] = []; changed = True
-    if "previous_active_state" not in d: d["previous_active_state"] = None; changed = True
-    if changed:
-        await update_by_id(COLL_CAMPAIGNS, campaign_id, {k: d[k] for k in ["counters","insights","insights_rich","previous_active_state"]})
     return d
 
 @api.post("/campaigns/{campaign_id}/state")
 async def change_mission_state(campaign_id: str, payload: Dict[str, Any]):
-    doc = await get_by_id(COLL_CAMPAIGNS, campaign_id)
-    if not doc:
-        raise HTTPException(status_code=404, detail="Mission not found")
     state = payload.get("state")
+    event = None
     if state == "resume":
-        state = doc.get("previous_active_state") or "scanning"
-        await log_event("mission_resumed", "backend/api", {"campaign_id": campaign_id})
-    elif state in {"abort", "aborted"}:
-        state = "aborted"
-        await log_event("mission_aborted", "backend/api", {"campaign_id": campaign_id})
-    elif state == "paused":
-        await log_event("mission_paused", "backend/api", {"campaign_id": campaign_id})
-    elif state == "complete":
-        await log_event("mission_completed", "backend/api", {"campaign_id": campaign_id})
-    await update_by_id(COLL_CAMPAIGNS, campaign_id, {"state": state})
-    return await get_by_id(COLL_CAMPAIGNS, campaign_id)
+        event = "mission_resumed"
+        # resolve the prior active state inside the update, so there is no read beforehand
+        resumed = {"$cond": [{"$eq": [{"$ifNull": ["$previous_active_state", ""]}, ""]}, "scanning", "$previous_active_state"]}
+        doc = await COLL_CAMPAIGNS.find_one_and_update(
+            {"_id": campaign_id}, [{"$set": {"state": resumed, "updated_at": UPDATED_AT_NOW}}],
+            projection={"_id": 0}, return_document=ReturnDocument.AFTER,
+        )
+        bump_version(COLL_CAMPAIGNS)
+    else:
+        if state in {"abort", "aborted"}:
+            state, event = "aborted", "mission_aborted"
+        elif state == "paused":
+            event = "mission_paused"
+        elif state == "complete":
+            event = "mission_completed"
+        doc = await update_and_get(COLL_CAMPAIGNS, campaign_id, {"state": state})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Mission not found")
+    if event:
+        await log_event(event, "backend/api", {"campaign_id": campaign_id})
+    return doc
 
 # Findings
 class Finding(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    # schema reference for snapshot_findings' documents; never instantiated, so build the core schema on demand
+    model_config = ConfigDict(extra="forbid", defer_build=True)
     id: str = Field(default_factory=new_id)
     campaign_id: Optional[str] = None
     thread_id: Optional[str] = None
@@ -240,63 +411,72 @@ class FindingPatch(BaseModel):
     metrics: Optional[Dict[str, Any]] = None
     attachments: Optional[List[Dict[str, Any]]] = None
 
+def finding_defaults() -> Dict[str, Any]:
+    ts = now_iso()
+    return {
+        "title": "",
+        "body_markdown": "",
+        "highlights": [],
+        "metrics": {},
+        "campaign_id": None,
+        "created_at": ts,
+        "updated_at": ts,
+    }
+
 @api.get("/findings")
 async def list_findings(campaign_id: Optional[str] = None, limit: int = 200):
     q: Dict[str, Any] = {}
     if campaign_id:
         q["campaign_id"] = campaign_id
-    docs = await COLL_FINDINGS.find(q).sort("updated_at", -1).limit(limit).to_list(limit)
-    out = []
-    for d in docs:
-        d.pop("_id", None)
-        d.setdefault("title", "")
-        d.setdefault("body_markdown", "")
-        d.setdefault("highlights", [])
-        d.setdefault("metrics", {})
-        d.setdefault("campaign_id", None)
-        d.setdefault("created_at", now_iso())
-        d.setdefault("updated_at", now_iso())
-        out.append(d)
-    return out
+    return await COLL_FINDINGS.find(q, FINDING_LIST_PROJECTION).sort("updated_at", -1).limit(limit).batch_size(limit).to_list(limit)
 
 @api.get("/findings/{finding_id}")
 async def get_finding(finding_id: str):
     d = await get_by_id(COLL_FINDINGS, finding_id)
     if not d:
         raise HTTPException(status_code=404, detail="Finding not found")
-    changed = False
-    for k, v in {"title":"", "body_markdown":"", "highlights":[], "metrics":{}, "campaign_id":None}.items():
-        if k not in d:
-            d[k] = v
-            changed = True
-    if changed:
-        await update_by_id(COLL_FINDINGS, finding_id, {k: d[k] for k in ["title","body_markdown","highlights","metrics","campaign_id"]})
     return d
 
 @api.patch("/findings/{finding_id}")
 async def patch_finding(finding_id: str, payload: FindingPatch):
     data = payload.model_dump(exclude_unset=True)
-    await update_by_id(COLL_FINDINGS, finding_id, data)
-    return await get_by_id(COLL_FINDINGS, finding_id)
+    if not data:
+        # no-op autosave: nothing to write, not even updated_at
+        return await get_by_id(COLL_FINDINGS, finding_id)
+    return await update_and_get(COLL_FINDINGS, finding_id, data)
+
+FINDING_CSV_COLUMNS = ["id", "campaign_id", "thread_id", "title", "updated_at"]
+
+class _Echo:
+    # File-like sink for csv.writer: write() hands the formatted line straight back to writerow()
+    def write(self, value: str) -> str:
+        return value
+
+async def finding_csv_rows(findings: List[Dict[str, Any]]):
+    # Each row is formatted and yielded on its own, so memory stays constant however many findings are exported
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FINDING_CSV_COLUMNS).encode()
+    for d in findings:
+        yield writer.writerow([d.get(c) for c in FINDING_CSV_COLUMNS]).encode()
+
+async def finding_md_chunks(d: Dict[str, Any]):
+    yield f"# {d.get('title','')}\n\n".encode()
+    body = d.get("body_markdown", "") or ""
+    if body: yield body.encode()
 
 @api.post("/findings/{finding_id}/export")
 async def export_finding(finding_id: str, format: str = "md"):
-    d = await COLL_FINDINGS.find_one({"_id": finding_id})
+    d = await COLL_FINDINGS.find_one({"_id": finding_id}, {"_id": 0})
     if not d:
         raise HTTPException(status_code=404, detail="Finding not found")
-    d.pop("_id", None)
     filename = f"finding_{finding_id}.{ 'md' if format=='md' else 'csv' }"
     if format == "md":
-        content = f"# {d.get('title','')}\n\n" + (d.get("body_markdown", "") or "")
-        media = "text/markdown"
+        body, media = finding_md_chunks(d), "text/markdown"
     else:
-        out = io.StringIO(); writer = csv.writer(out)
-        writer.writerow(["id","campaign_id","thread_id","title","updated_at"])
-        writer.writerow([d.get("id"), d.get("campaign_id"), d.get("thread_id"), d.get("title"), d.get("updated_at")])
-        content = out.getvalue(); media = "text/csv"
+        body, media = finding_csv_rows([d]), "text/csv"
     headers = {"Content-Disposition": f"attachment; filename={filename}"}
     await log_event("findings_exported", "backend/findings", {"finding_id": finding_id, "format": format})
-    return Response(content=content, media_type=media, headers=headers)
+    return StreamingResponse(body, media_type=media, headers=headers)
 
 # Snapshot Findings
 class SnapshotFindingInput(BaseModel):
@@ -305,13 +485,28 @@ class SnapshotFindingInput(BaseModel):
 
 @api.post("/mission_control/snapshot_findings")
 async def snapshot_findings(payload: SnapshotFindingInput):
-    th = await COLL_THREADS.find_one({"_id": payload.thread_id})
-    if not th:
+    # Thread plus its last 6 messages in one round trip
+    pipeline = [
+        {"$match": {"_id": payload.thread_id}},
+        {"$lookup": {
+            "from": COLL_MESSAGES.name,
+            "let": {"tid": "$_id"},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$thread_id", "$$tid"]}}},
+                {"$sort": {"created_at": -1}},
+                {"$limit": 6},
+                {"$project": {"_id": 0, "role": 1, "text": 1, "created_at": 1}},
+            ],
+            "as": "_msgs",
+        }},
+    ]
+    found = await COLL_THREADS.aggregate(pipeline).to_list(1)
+    if not found:
         raise HTTPException(status_code=404, detail="Thread not found")
+    th = found[0]
     if not th.get("campaign_id"):
         raise HTTPException(status_code=400, detail="Thread not linked to a mission")
-    msgs = await COLL_MESSAGES.find({"thread_id": payload.thread_id}).sort("created_at", -1).limit(6).to_list(6)
-    msgs = list(reversed(msgs))
+    msgs = list(reversed(th.pop("_msgs")))
     lines = [
         f"Goal: {th.get('goal','')}",
         f"Stage: {th.get('stage','brainstorm')}",
@@ -324,8 +519,13 @@ async def snapshot_findings(payload: SnapshotFindingInput):
         lines.append(f"- {ts} {m.get('role')}: {m.get('text')}")
     body = "\n".join(lines)
     title = f"Findings - {th.get('title','Thread')} {now_iso()}"
-    fdoc = Finding(campaign_id=th.get("campaign_id"), thread_id=payload.thread_id, title=title, body_markdown=body)
-    doc = await insert_with_id(COLL_FINDINGS, fdoc.model_dump())
+    # Same shape as Finding.model_dump(), without validating server-built values
+    ts = now_iso()
+    doc = await insert_with_id(COLL_FINDINGS, {
+        "id": new_id(), "campaign_id": th.get("campaign_id"), "thread_id": payload.thread_id,
+        "title": title, "body_markdown": body, "highlights": [], "metrics": {}, "attachments": [],
+        "created_at": ts, "updated_at": ts,
+    })
     await log_event("findings_created", "backend/findings", {"finding_id": doc['id'], "campaign_id": doc['campaign_id'], "thread_id": doc['thread_id']})
     return doc
 
@@ -344,6 +544,9 @@ class Thread(BaseModel):
     created_at: str = Field(default_factory=now_iso)
     updated_at: str = Field(default_factory=now_iso)
 
+# stage_history only grows and no client view reads it
+THREAD_VIEW_PROJECTION = {"stage_history": 0}
+
 class ThreadCreate(BaseModel):
     model_config = ConfigDict(extra="forbid")
     title: str
@@ -358,7 +561,8 @@ class ThreadUpdate(BaseModel):
     synopsis: Optional[str] = None
 
 class Message(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    # schema reference for message_doc(); never instantiated, so the core schema is built only on demand
+    model_config = ConfigDict(extra="forbid", defer_build=True)
     id: str = Field(default_factory=new_id)
     thread_id: str
     campaign_id: Optional[str] = None
@@ -367,9 +571,26 @@ class Message(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
     created_at: str = Field(default_factory=now_iso)
 
+def message_doc(thread_id: str, campaign_id: Optional[str], role: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # Server-built messages are trusted: produce Message.model_dump() plus _id without re-validating
+    _id = new_id()
+    return {
+        "_id": _id,
+        "id": _id,
+        "thread_id": thread_id,
+        "campaign_id": campaign_id,
+        "role": role,
+        "text": text,
+        "metadata": metadata or {},
+        "created_at": now_iso(),
+    }
+
 from providers.selector import select_praefectus_default_model
 from providers.factory import get_llm_client
 
+# Caps in-flight chat completions in this worker; the effective cap across gunicorn workers is this times the worker count
+LLM_SEMAPHORE = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "16")))
+
 SYSTEM_PROMPT = (
     "You are PRAEFECTUS, Orchestrator & Campaign Commander for Augustus. "
     
@@ -429,15 +650,42 @@ SYSTEM_PROMPT = (
     "Respond in clear, concise prose. No JSON unless explicitly requested."
 )
 
+# Built once: the fixed leading message of every chat prompt. Keeping it first and byte-identical
+# lets the provider's automatic prefix caching reuse it across turns.
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+MISSION_STATE_TO_THREAD_STATUS = {
+    "scanning": "Running",
+    "engaging": "Running",
+    "escalating": "Running",
+    "paused": "Paused",
+    "complete": "Completed",
+    "aborted": "Aborted",
+}
+
 def map_thread_status(mission: Optional[Dict[str, Any]]) -> str:
     if not mission:
         return "Unlinked"
-    st = mission.get("state")
-    if st in {"scanning", "engaging", "escalating"}: return "Running"
-    if st == "paused": return "Paused"
-    if st == "complete": return "Completed"
-    if st == "aborted": return "Aborted"
-    return "Unlinked"
+    return MISSION_STATE_TO_THREAD_STATUS.get(mission.get("state"), "Unlinked")
+
+async def touch_thread(thread_id: str):
+    # bump only updated_at; run alongside the message insert rather than after it
+    await COLL_THREADS.update_one({"_id": thread_id}, [{"$set": {"updated_at": UPDATED_AT_NOW}}])
+
+async def general_thread() -> Dict[str, Any]:
+    # Get-or-create in one round trip. Keyed on is_general, which has a partial unique index, so a
+    # concurrent upsert that loses the race fails with a duplicate key and re-reads the winner's thread.
+    gen = Thread.model_construct(title="General")
+    gdoc = gen.model_dump(); gdoc["_id"] = gen.thread_id
+    for attempt in range(2):
+        try:
+            return await COLL_THREADS.find_one_and_update(
+                {"is_general": True}, {"$setOnInsert": gdoc}, projection=THREAD_VIEW_PROJECTION,
+                upsert=True, return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            if attempt:
+                raise
 
 @api.post("/mission_control/threads")
 async def create_thread(payload: ThreadCreate):
@@ -451,48 +699,137 @@ async def create_thread(payload: ThreadCreate):
 async def list_threads(campaign_id: Optional[str] = None):
     q: Dict[str, Any] = {}
     if campaign_id: q["campaign_id"] = campaign_id
-    threads = await COLL_THREADS.find(q).sort("updated_at", -1).to_list(200)
+    threads = await COLL_THREADS.find(q, THREAD_VIEW_PROJECTION).sort("updated_at", -1).to_list(200)
     if not threads:
-        gen = Thread(title="General")
-        gdoc = gen.model_dump(); gdoc["_id"] = gen.thread_id
-        await COLL_THREADS.insert_one(gdoc)
-        threads = [gdoc]
-    out = []
+        threads = [await general_thread()]
+    # one $in lookup for every linked mission instead of a find_one per thread
+    mids = list({d["campaign_id"] for d in threads if d.get("campaign_id")})
+    missions: Dict[str, Dict[str, Any]] = {}
+    if mids:
+        missions = {m.pop("_id"): m async for m in COLL_CAMPAIGNS.find({"_id": {"$in": mids}}, {"state": 1})}
     for d in threads:
-        mission = None
-        if d.get("campaign_id"):
-            mission = await COLL_CAMPAIGNS.find_one({"_id": d["campaign_id"]})
-            if mission: mission.pop("_id", None)
-        status = map_thread_status(mission)
         d.pop("_id", None)
-        out.append({**d, "thread_status": status})
-    return out
+        d["thread_status"] = map_thread_status(missions.get(d.get("campaign_id")))
+    return threads
+
+async def _none() -> None:
+    # placeholder for an optional branch of asyncio.gather
+    return None
 
 @api.get("/mission_control/thread/{thread_id}")
-async def get_thread(thread_id: str, limit: int = 50, before: Optional[str] = None):
-    th = await COLL_THREADS.find_one({"_id": thread_id})
+async def get_thread(thread_id: str, limit: int = 50, before: Optional[str] = None, before_created_at: Optional[str] = None):
+    # Page by the oldest loaded message's created_at; `before` (a message id) costs an extra lookup,
+    # which runs alongside the thread fetch
+    before_time = before_created_at
+    legacy_before = before and not before_time
+    th, m = await asyncio.gather(
+        COLL_THREADS.find_one({"_id": thread_id}, {**THREAD_VIEW_PROJECTION, "_id": 0}),
+        COLL_MESSAGES.find_one({"_id": before}, {"created_at": 1}) if legacy_before else _none(),
+    )
     if not th: raise HTTPException(status_code=404, detail="Thread not found")
-    before_time = None
-    if before:
-        m = await COLL_MESSAGES.find_one({"_id": before})
-        if m: before_time = m.get("created_at")
+    if m: before_time = m.get("created_at")
     mq: Dict[str, Any] = {"thread_id": thread_id}
     if before_time: mq["created_at"] = {"$lt": before_time}
-    msgs = await COLL_MESSAGES.find(mq).sort("created_at", -1).limit(limit).to_list(limit)
-    for d in msgs: d.pop("_id", None)
-    mission = None
-    if th.get("campaign_id"):
-        mission = await COLL_CAMPAIGNS.find_one({"_id": th.get("campaign_id")})
-        if mission: mission.pop("_id", None)
-    status = map_thread_status(mission)
+    # the page and the linked mission's state are independent
+    msgs, mission = await asyncio.gather(
+        COLL_MESSAGES.find(mq, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit),
+        COLL_CAMPAIGNS.find_one({"_id": th["campaign_id"]}, {"_id": 0, "state": 1}) if th.get("campaign_id") else _none(),
+    )
+    th["thread_status"] = map_thread_status(mission)
     await log_event("thread_loaded", "backend/mission_control", {"thread_id": thread_id})
-    th_clean = {k: v for k, v in th.items() if k != "_id"}
-    return {"thread": {**th_clean, "thread_status": status}, "messages": list(reversed(msgs))}
+    msgs.reverse()
+    return {"thread": th, "messages": msgs}
 
 class MCChatInput(BaseModel):
     model_config = ConfigDict(extra="forbid")
     thread_id: Optional[str] = None
     text: str
+    # opt-in: stream the LLM reply as server-sent events (trigger phrases still answer with JSON)
+    stream: bool = False
+
+# Mission Control trigger phrases: each handler returns the response, or None to fall through to the LLM.
+# Handlers persist the human turn (hdoc) together with their reply in one insert_many.
+async def _mc_create_mission(thread_id: str, th: Dict[str, Any], hdoc: Dict[str, Any], announce: bool = False) -> Dict[str, Any]:
+    # the human turn is stored alongside the mission insert, so it is kept even if that insert fails
+    created, _ = await asyncio.gather(
+        create_mission(CampaignCreate(**{
+            "title": th.get("title", "New Mission"),
+            "objective": "",
+            "posture": "research_only",
+            "state": "scanning",
+        })),
+        COLL_MESSAGES.insert_one(hdoc),
+    )
+    campaign_id = created["id"]
+    text = "Mission created. Would you like to make modifications before starting?"
+    adoc = message_doc(thread_id=thread_id, campaign_id=campaign_id, role="praefectus", text=text, metadata={"actions": ["start_now", "edit_draft"]})
+    writes = [update_by_id(COLL_THREADS, thread_id, {"campaign_id": campaign_id})]
+    if announce:
+        writes.append(log_event("mission_created", "backend/mission_control", {"campaign_id": campaign_id, "thread_id": thread_id}))
+    # independent writes: overlap their round trips
+    await asyncio.gather(
+        *writes,
+        log_event("run_controls_used", "backend/mission_control", {"action": "run_create", "thread_id": thread_id, "campaign_id": campaign_id}),
+        COLL_MESSAGES.insert_one(adoc),
+    )
+    return {"assistant": {"text": text, "created_at": adoc["created_at"], "metadata": adoc["metadata"]}, "campaign_id": campaign_id}
+
+async def _mc_create(thread_id: str, th: Dict[str, Any], hdoc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    return await _mc_create_mission(thread_id, th, hdoc)
+
+async def _mc_run(thread_id: str, th: Dict[str, Any], hdoc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not th.get("campaign_id"):
+        return await _mc_create_mission(thread_id, th, hdoc, announce=True)
+    mission = await get_by_id(COLL_CAMPAIGNS, th["campaign_id"])
+    if mission.get("state") == "paused":
+        prior = mission.get("previous_active_state") or "scanning"
+        text = "Resumed the mission. Ready to continue."
+        adoc = message_doc(thread_id=thread_id, campaign_id=mission["id"], role="praefectus", text=text, metadata={"actions": ["start_now", "edit_draft"]})
+        await asyncio.gather(
+            update_by_id(COLL_CAMPAIGNS, mission["id"], {"state": prior}),
+            log_event("mission_resumed", "backend/mission_control", {"campaign_id": mission["id"]}),
+            COLL_MESSAGES.insert_many([hdoc, adoc]),
+            touch_thread(thread_id),
+            log_event("run_controls_used", "backend/mission_control", {"action": "run_resume", "thread_id": thread_id, "campaign_id": mission["id"]}),
+        )
+        return {"assistant": {"text": text, "created_at": adoc["created_at"]}}
+    if mission.get("state") in {"complete", "aborted"}:
+        # duplicate; the run's reply lands in a new thread, so the human turn is stored on its own
+        _, dup = await asyncio.gather(
+            COLL_MESSAGES.insert_one(hdoc),
+            duplicate_run_internal(campaign_id=mission["id"], source_thread_id=thread_id, start_now=True),
+        )
+        return dup
+    text = "Mission is already running."
+    adoc = message_doc(thread_id=thread_id, campaign_id=mission["id"], role="praefectus", text=text)
+    await asyncio.gather(COLL_MESSAGES.insert_many([hdoc, adoc]), touch_thread(thread_id))
+    return {"assistant": {"text": text, "created_at": adoc["created_at"]}}
+
+def _mc_state_trigger(action: str, event_name: str, changes: Dict[str, Any], text: str):
+    async def handler(thread_id: str, th: Dict[str, Any], hdoc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        campaign_id = th.get("campaign_id")
+        if not campaign_id:
+            return None
+        adoc = message_doc(thread_id=thread_id, campaign_id=campaign_id, role="praefectus", text=text)
+        await asyncio.gather(
+            update_by_id(COLL_CAMPAIGNS, campaign_id, dict(changes)),
+            log_event(event_name, "backend/mission_control", {"campaign_id": campaign_id}),
+            COLL_MESSAGES.insert_many([hdoc, adoc]),
+            touch_thread(thread_id),
+            log_event("run_controls_used", "backend/mission_control", {"action": action, "thread_id": thread_id, "campaign_id": campaign_id}),
+        )
+        return {"assistant": {"text": text, "created_at": adoc["created_at"]}}
+    return handler
+
+MC_TRIGGERS = {
+    "create mission now": _mc_create,
+    "approve and create mission now": _mc_create,
+    "create & start mission now": _mc_create,
+    "run mission now": _mc_run,
+    "pause mission": _mc_state_trigger("pause", "mission_paused", {"state": "paused", "previous_active_state": "engaging"}, "Mission paused."),
+    "stop mission": _mc_state_trigger("stop", "mission_completed", {"state": "complete"}, "Mission stopped and marked complete."),
+    "abort mission": _mc_state_trigger("abort", "mission_aborted", {"state": "aborted"}, "Mission aborted."),
+}
 
 @api.post("/mission_control/message")
 async def mission_control_message(payload: MCChatInput):
@@ -500,122 +837,30 @@ async def mission_control_message(payload: MCChatInput):
     if not txt: raise HTTPException(status_code=400, detail="text is required")
     thread_id = payload.thread_id
     if not thread_id:
-        gen = await COLL_THREADS.find_one({"title": "General"})
-        if not gen:
-            gen_t = Thread(title="General")
-            gdoc = gen_t.model_dump(); gdoc["_id"] = gen_t.thread_id
-            await COLL_THREADS.insert_one(gdoc)
-            gen = gdoc
-        thread_id = gen.get("_id") or gen.get("thread_id")
-    th = await COLL_THREADS.find_one({"_id": thread_id})
+        th = await general_thread()
+        thread_id = th.get("_id") or th.get("thread_id")
+    else:
+        th = await COLL_THREADS.find_one({"_id": thread_id})
     if not th: raise HTTPException(status_code=404, detail="Thread not found")
 
-    # append human
-    human = Message(thread_id=thread_id, campaign_id=th.get("campaign_id"), role="human", text=txt)
-    hdoc = human.model_dump(); hdoc["_id"] = human.id
-    await COLL_MESSAGES.insert_one(hdoc)
+    # human turn; trigger handlers store it alongside their reply
+    hdoc = message_doc(thread_id=thread_id, campaign_id=th.get("campaign_id"), role="human", text=txt)
 
-    lowered = txt.lower().strip()
-    # triggers
-    if lowered in {"create mission now", "approve and create mission now", "create & start mission now"}:
-        created = await create_mission(CampaignCreate(**{
-            "title": th.get("title", "New Mission"),
-            "objective": "",
-            "posture": "research_only",
-            "state": "scanning",
-        }))
-        campaign_id = created["id"]
-        await update_by_id(COLL_THREADS, thread_id, {"campaign_id": campaign_id})
-        await log_event("run_controls_used", "backend/mission_control", {"action": "run_create", "thread_id": thread_id, "campaign_id": campaign_id})
-        text = "Mission created. Would you like to make modifications before starting?"
-        assistant = Message(thread_id=thread_id, campaign_id=campaign_id, role="praefectus", text=text, metadata={"actions": ["start_now", "edit_draft"]})
-        adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-        await COLL_MESSAGES.insert_one(adoc)
-        await update_by_id(COLL_THREADS, thread_id, {})
-        return {"assistant": {"text": text, "created_at": assistant.created_at, "metadata": assistant.metadata}, "campaign_id": campaign_id}
-
-    if lowered == "run mission now":
-        if th.get("campaign_id"):
-            mission = await get_by_id(COLL_CAMPAIGNS, th["campaign_id"])
-            if mission.get("state") == "paused":
-                prior = mission.get("previous_active_state") or "scanning"
-                await update_by_id(COLL_CAMPAIGNS, mission["id"], {"state": prior})
-                await log_event("mission_resumed", "backend/mission_control", {"campaign_id": mission["id"]})
-                text = "Resumed the mission. Ready to continue."
-                assistant = Message(thread_id=thread_id, campaign_id=mission["id"], role="praefectus", text=text, metadata={"actions": ["start_now", "edit_draft"]})
-                adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-                await COLL_MESSAGES.insert_one(adoc)
-                await update_by_id(COLL_THREADS, thread_id, {})
-                await log_event("run_controls_used", "backend/mission_control", {"action": "run_resume", "thread_id": thread_id, "campaign_id": mission["id"]})
-                return {"assistant": {"text": text, "created_at": assistant.created_at}}
-            if mission.get("state") in {"complete", "aborted"}:
-                # duplicate
-                dup = await duplicate_run_internal(campaign_id=mission["id"], source_thread_id=thread_id, start_now=True)
-                return dup
-            text = "Mission is already running."
-            assistant = Message(thread_id=thread_id, campaign_id=mission["id"], role="praefectus", text=text)
-            adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-            await COLL_MESSAGES.insert_one(adoc)
-            await update_by_id(COLL_THREADS, thread_id, {})
-            return {"assistant": {"text": text, "created_at": assistant.created_at}}
-        else:
-            created = await create_mission(CampaignCreate(**{
-                "title": th.get("title", "New Mission"),
-                "objective": "",
-                "posture": "research_only",
-                "state": "scanning",
-            }))
-            campaign_id = created["id"]
-            await update_by_id(COLL_THREADS, thread_id, {"campaign_id": campaign_id})
-            await log_event("mission_created", "backend/mission_control", {"campaign_id": campaign_id, "thread_id": thread_id})
-            await log_event("run_controls_used", "backend/mission_control", {"action": "run_create", "thread_id": thread_id, "campaign_id": campaign_id})
-            text = "Mission created. Would you like to make modifications before starting?"
-            assistant = Message(thread_id=thread_id, campaign_id=campaign_id, role="praefectus", text=text, metadata={"actions": ["start_now", "edit_draft"]})
-            adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-            await COLL_MESSAGES.insert_one(adoc)
-            await update_by_id(COLL_THREADS, thread_id, {})
-            return {"assistant": {"text": text, "created_at": assistant.created_at, "metadata": assistant.metadata}, "campaign_id": campaign_id}
-
-    if lowered == "pause mission" and th.get("campaign_id"):
-        await update_by_id(COLL_CAMPAIGNS, th["campaign_id"], {"state": "paused", "previous_active_state": "engaging"})
-        await log_event("mission_paused", "backend/mission_control", {"campaign_id": th["campaign_id"]})
-        text = "Mission paused."
-        assistant = Message(thread_id=thread_id, campaign_id=th["campaign_id"], role="praefectus", text=text)
-        adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-        await COLL_MESSAGES.insert_one(adoc)
-        await update_by_id(COLL_THREADS, thread_id, {})
-        await log_event("run_controls_used", "backend/mission_control", {"action": "pause", "thread_id": thread_id, "campaign_id": th["campaign_id"]})
-        return {"assistant": {"text": text, "created_at": assistant.created_at}}
-
-    if lowered == "stop mission" and th.get("campaign_id"):
-        await update_by_id(COLL_CAMPAIGNS, th["campaign_id"], {"state": "complete"})
-        await log_event("mission_completed", "backend/mission_control", {"campaign_id": th["campaign_id"]})
-        text = "Mission stopped and marked complete."
-        assistant = Message(thread_id=thread_id, campaign_id=th["campaign_id"], role="praefectus", text=text)
-        adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-        await COLL_MESSAGES.insert_one(adoc)
-        await update_by_id(COLL_THREADS, thread_id, {})
-        await log_event("run_controls_used", "backend/mission_control", {"action": "stop", "thread_id": thread_id, "campaign_id": th["campaign_id"]})
-        return {"assistant": {"text": text, "created_at": assistant.created_at}}
-
-    if lowered == "abort mission" and th.get("campaign_id"):
-        await update_by_id(COLL_CAMPAIGNS, th["campaign_id"], {"state": "aborted"})
-        await log_event("mission_aborted", "backend/mission_control", {"campaign_id": th["campaign_id"]})
-        text = "Mission aborted."
-        assistant = Message(thread_id=thread_id, campaign_id=th["campaign_id"], role="praefectus", text=text)
-        adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-        await COLL_MESSAGES.insert_one(adoc)
-        await update_by_id(COLL_THREADS, thread_id, {})
-        await log_event("run_controls_used", "backend/mission_control", {"action": "abort", "thread_id": thread_id, "campaign_id": th["campaign_id"]})
-        return {"assistant": {"text": text, "created_at": assistant.created_at}}
+    handler = MC_TRIGGERS.get(txt.lower())
+    if handler:
+        reply = await handler(thread_id, th, hdoc)
+        if reply is not None:
+            return reply
 
+    # Store the human turn while the history before it loads; the turn itself is appended to the prompt below
+    stored = asyncio.ensure_future(COLL_MESSAGES.insert_one(hdoc))
     # CRITICAL FIX: Get conversation history from this thread
     # Retrieve all messages from the current thread for context
     try:
-        thread_messages = await COLL_MESSAGES.find({"thread_id": thread_id}).sort("created_at", 1).to_list(200)
+        thread_messages = await COLL_MESSAGES.find({"thread_id": thread_id, "created_at": {"$lt": hdoc["created_at"]}}).sort("created_at", 1).to_list(200)
         
         # Build conversation history with proper role mapping
-        conversation_history = [{"role": "system", "content": SYSTEM_PROMPT}]
+        conversation_history = [SYSTEM_MESSAGE]
         
         for msg in thread_messages:
             if msg.get("role") == "human":
@@ -628,21 +873,51 @@ async def mission_control_message(payload: MCChatInput):
         
     except Exception as e:
         # Fallback to single message if conversation retrieval fails
-        conversation_history = [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": txt}]
+        conversation_history = [SYSTEM_MESSAGE, {"role": "user", "content": txt}]
+    await stored
     
     # default LLM reply WITH CONVERSATION CONTEXT
-    client = get_llm_client(); model_id = select_praefectus_default_model()
+    client = get_llm_client(); model_id = await select_praefectus_default_model()
+    if payload.stream:
+        return stream_praefectus_reply(client, model_id, conversation_history, thread_id, th.get("campaign_id"))
     try:
-        r = client.chat(model_id=model_id, messages=conversation_history, temperature=0.3, max_tokens=800)
+        async with LLM_SEMAPHORE:
+            r = await client.chat(model_id=model_id, messages=conversation_history, temperature=0.3, max_tokens=800)
         assistant_text = r.get("text", "")
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"LLM error: {e}")
-    assistant = Message(thread_id=thread_id, campaign_id=th.get("campaign_id"), role="praefectus", text=assistant_text)
-    adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-    await COLL_MESSAGES.insert_one(adoc)
-    await update_by_id(COLL_THREADS, thread_id, {})
-    await log_event("praefectus_message_appended", "backend/mission_control", {"thread_id": thread_id})
-    return {"assistant": {"text": assistant_text, "created_at": assistant.created_at}}
+    adoc = message_doc(thread_id=thread_id, campaign_id=th.get("campaign_id"), role="praefectus", text=assistant_text)
+    await persist_praefectus_reply(adoc)
+    return {"assistant": {"text": assistant_text, "created_at": adoc["created_at"]}}
+
+async def persist_praefectus_reply(adoc: Dict[str, Any]):
+    await asyncio.gather(COLL_MESSAGES.insert_one(adoc), touch_thread(adoc["thread_id"]))
+    await log_event("praefectus_message_appended", "backend/mission_control", {"thread_id": adoc["thread_id"]})
+
+def stream_praefectus_reply(client, model_id: str, messages: List[Dict[str, str]], thread_id: str, campaign_id: Optional[str]) -> StreamingResponse:
+    # Tokens reach the client as they arrive; the assembled reply is stored after the response completes
+    state: Dict[str, Any] = {}
+
+    async def events():
+        parts: List[str] = []
+        try:
+            async with LLM_SEMAPHORE:
+                async for delta in client.chat_stream(model_id, messages, 0.3, 800):
+                    parts.append(delta)
+                    yield b"data: " + orjson.dumps({"delta": delta}) + b"\n\n"
+        except Exception as e:
+            # headers are already sent, so report the failure in-band and store nothing
+            yield b"data: " + orjson.dumps({"error": f"LLM error: {e}"}) + b"\n\n"
+            return
+        adoc = state["adoc"] = message_doc(thread_id=thread_id, campaign_id=campaign_id, role="praefectus", text="".join(parts))
+        yield b"data: " + orjson.dumps({"assistant": {"text": adoc["text"], "created_at": adoc["created_at"]}}) + b"\n\n"
+        yield b"data: [DONE]\n\n"
+
+    async def persist():
+        if "adoc" in state:
+            await persist_praefectus_reply(state["adoc"])
+
+    return StreamingResponse(events(), media_type="text/event-stream", background=BackgroundTask(persist))
 
 # Duplicate run and start
 class DuplicateRunInput(BaseModel):
@@ -653,31 +928,41 @@ class DuplicateRunInput(BaseModel):
     start_now: Optional[bool] = True
 
 async def duplicate_run_internal(campaign_id: str, source_thread_id: str, start_now: bool = True):
-    base = await get_by_id(COLL_CAMPAIGNS, campaign_id)
+    base, src_thread = await asyncio.gather(
+        get_by_id(COLL_CAMPAIGNS, campaign_id),
+        COLL_THREADS.find_one({"_id": source_thread_id}),
+    )
     if not base: raise HTTPException(status_code=404, detail="Mission not found")
-    src_thread = await COLL_THREADS.find_one({"_id": source_thread_id})
     if not src_thread: raise HTTPException(status_code=404, detail="Source thread not found")
-    created = await create_mission(CampaignCreate(**{
+    # Build the mission, its thread and the system message locally, then write them together.
+    # A started run is created directly in its running state rather than created then updated.
+    mission = Campaign(**{
         "title": base.get("title", src_thread.get("title", "New Mission")),
         "objective": base.get("objective", ""),
         "posture": base.get("posture", "research_only"),
-        "state": "scanning",
-    }))
-    new_thread = Thread(title=src_thread.get("title", base.get("title", "New Run")), goal=src_thread.get("goal"), synopsis=src_thread.get("synopsis"), campaign_id=created["id"])  # type: ignore
+        "state": "engaging" if start_now else "scanning",
+    })
+    mdoc = mission.model_dump(); mdoc["_id"] = mission.id
+    # values come from stored, already-validated documents: build without re-validating
+    new_thread = Thread.model_construct(title=src_thread.get("title", base.get("title", "New Run")), goal=src_thread.get("goal"), synopsis=src_thread.get("synopsis"), campaign_id=mission.id)  # type: ignore
     ndoc = new_thread.model_dump(); ndoc["_id"] = new_thread.thread_id
-    await COLL_THREADS.insert_one(ndoc)
-    await log_event("mission_created", "backend/mission_control", {"campaign_id": created["id"], "duplicated_from": campaign_id})
-    if start_now:
-        await update_by_id(COLL_CAMPAIGNS, created["id"], {"state": "engaging"})
-        await log_event("mission_started", "backend/mission_control", {"campaign_id": created["id"]})
-    # system message
     text = "New run created. Any changes before starting?"
-    assistant = Message(thread_id=new_thread.thread_id, campaign_id=created["id"], role="praefectus", text=text, metadata={"actions": ["start_now", "edit_draft"]})
-    adoc = assistant.model_dump(); adoc["_id"] = assistant.id
-    await COLL_MESSAGES.insert_one(adoc)
-    await update_by_id(COLL_THREADS, new_thread.thread_id, {})
-    await log_event("run_controls_used", "backend/mission_control", {"action": "duplicate_start", "thread_id": new_thread.thread_id, "campaign_id": created["id"]})
-    return {"assistant": {"text": text, "created_at": assistant.created_at, "metadata": assistant.metadata}, "campaign_id": created["id"], "thread_id": new_thread.thread_id}
+    adoc = message_doc(thread_id=new_thread.thread_id, campaign_id=mission.id, role="praefectus", text=text, metadata={"actions": ["start_now", "edit_draft"]})
+    events = [
+        ("mission_created", "backend/api", {"campaign_id": mission.id}),
+        ("mission_created", "backend/mission_control", {"campaign_id": mission.id, "duplicated_from": campaign_id}),
+    ]
+    if start_now:
+        events.append(("mission_started", "backend/mission_control", {"campaign_id": mission.id}))
+    events.append(("run_controls_used", "backend/mission_control", {"action": "duplicate_start", "thread_id": new_thread.thread_id, "campaign_id": mission.id}))
+    await asyncio.gather(
+        COLL_CAMPAIGNS.insert_one(mdoc),
+        COLL_THREADS.insert_one(ndoc),
+        COLL_MESSAGES.insert_one(adoc),
+        *(log_event(name, src, data) for name, src, data in events),
+    )
+    bump_version(COLL_CAMPAIGNS)
+    return {"assistant": {"text": text, "created_at": adoc["created_at"], "metadata": adoc["metadata"]}, "campaign_id": mission.id, "thread_id": new_thread.thread_id}
 
 @api.post("/mission_control/duplicate_run")
 async def duplicate_run(payload: DuplicateRunInput):
@@ -726,13 +1011,12 @@ class ForumUpdate(BaseModel):
 
 @api.get("/forums")
 async def list_forums():
-    docs = await COLL_FORUMS.find().sort("updated_at", -1).to_list(500)
-    out = []
-    for d in docs:
-        d.pop("_id", None)
-        d.setdefault("topic_tags", [])
-        out.append(d)
-    return out
+    version = coll_version(COLL_FORUMS)
+    cached = cached_response("forums", version)
+    if cached:
+        return cached
+    out = await list_shaped(COLL_FORUMS, {"topic_tags": []}, 500)
+    return cache_response("forums", version, out)
 
 @api.post("/forums")
 async def create_forum(payload: ForumCreate):
@@ -740,26 +1024,58 @@ async def create_forum(payload: ForumCreate):
     doc = await insert_with_id(COLL_FORUMS, f.model_dump())
     return doc
 
+async def probe_link(url: str) -> int:
+    # HEAD moves only headers; servers that refuse it get a one-byte ranged GET
+    http = app.state.http
+    async with http.head(url, allow_redirects=True) as resp:
+        if resp.status not in (405, 501):
+            return resp.status
+    async with http.get(url, headers={"Range": "bytes=0-0"}) as resp:
+        return resp.status
+
+async def link_status(url: Optional[str]) -> str:
+    try:
+        code = await probe_link(url)
+    except Exception:
+        return "blocked"
+    if 200 <= code < 400:
+        return "ok"
+    if code == 404:
+        return "not_found"
+    return "blocked"
+
 @api.post("/forums/{forum_id}/check_link")
 async def forum_check_link(forum_id: str):
     f = await get_by_id(COLL_FORUMS, forum_id)
     if not f:
         raise HTTPException(status_code=404, detail="Forum not found")
-    status = "blocked"
-    try:
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f.get("url"), timeout=8) as resp:
-                if 200 <= resp.status < 400:
-                    status = "ok"
-                elif resp.status == 404:
-                    status = "not_found"
-                else:
-                    status = "blocked"
-    except Exception:
-        status = "blocked"
-    await update_by_id(COLL_FORUMS, forum_id, {"link_status": status, "last_checked_at": now_iso()})
-    return await get_by_id(COLL_FORUMS, forum_id)
+    status = await link_status(f.get("url"))
+    return await update_and_get(COLL_FORUMS, forum_id, {"link_status": status, "last_checked_at": now_iso()})
+
+@api.post("/forums/check_link_all")
+async def forum_check_link_all():
+    # overlap the checks, but cap in-flight requests so the shared connector is not exhausted
+    sem = asyncio.Semaphore(20)
+    async def check(f: Dict[str, Any]) -> Tuple[str, str]:
+        async with sem:
+            return f["_id"], await link_status(f.get("url"))
+    statuses: Dict[str, str] = {}
+    # page by _id so every forum is checked without holding one cursor open across the slow probes
+    q: Dict[str, Any] = {}
+    while True:
+        forums = await COLL_FORUMS.find(q, {"url": 1}).sort("_id", 1).limit(LIST_BATCH_SIZE).to_list(LIST_BATCH_SIZE)
+        if not forums:
+            break
+        results = await asyncio.gather(*(check(f) for f in forums))
+        ts = now_iso()
+        await COLL_FORUMS.bulk_write(
+            [UpdateOne({"_id": fid}, _update_spec({"link_status": st, "last_checked_at": ts})) for fid, st in results],
+            ordered=False,
+        )
+        bump_version(COLL_FORUMS)
+        statuses.update(results)
+        q = {"_id": {"$gt": forums[-1]["_id"]}}
+    return {"checked": len(statuses), "statuses": statuses}
 
 # Agents endpoints
 class Agent(BaseModel):
@@ -796,27 +1112,25 @@ async def list_agents():
     await seed_agents()
     
     # Get agents with proper status logic
-    docs = await COLL_AGENTS.find().to_list(100)
+    # the research_only check runs once, alongside the agents read, rather than inside the loop
+    docs, research_mission = await asyncio.gather(
+        COLL_AGENTS.find({}, {"_id": 0}).to_list(100),
+        COLL_CAMPAIGNS.find_one({
+            "posture": "research_only",
+            "state": {"$in": ["scanning", "engaging"]}
+        }, {"_id": 1}),
+    )
     agents = []
+    pending = []
     
     for d in docs:
-        d.pop("_id", None)
-        
         # Apply status logic based on missions
         if d["agent_name"] == "Legatus":
-            # Check if any research_only missions are active
-            research_missions = await COLL_CAMPAIGNS.find({
-                "posture": "research_only", 
-                "state": {"$in": ["scanning", "engaging"]}
-            }).to_list(1)
-            if research_missions:
-                d["status_light"] = "yellow"
-            else:
-                d["status_light"] = "green"
+            # Yellow while any research_only mission is active
+            d["status_light"] = "yellow" if research_mission else "green"
         
         # Handle auto-reset for Explorator
         if d["agent_name"] == "Explorator" and d.get("next_retry_at"):
-            from datetime import datetime
             try:
                 retry_time = datetime.fromisoformat(d["next_retry_at"].replace("Z", "+00:00"))
                 now_time = datetime.now(retry_time.tzinfo)
@@ -825,17 +1139,19 @@ async def list_agents():
                     d["status_light"] = "green"
                     d["error_state"] = None
                     d["next_retry_at"] = None
-                    await update_by_id(COLL_AGENTS, d["id"], {
+                    pending.append(update_by_id(COLL_AGENTS, d["id"], {
                         "status_light": "green",
                         "error_state": None,
                         "next_retry_at": None
-                    })
-                    await log_event("agent_error_cleared", "backend/agents", {"agent_name": "Explorator"})
+                    }))
+                    pending.append(log_event("agent_error_cleared", "backend/agents", {"agent_name": "Explorator"}))
             except:
                 pass
         
         agents.append(d)
     
+    if pending:
+        await asyncio.gather(*pending)
     return agents
 
 # Scenario endpoints for testing
@@ -845,7 +1161,6 @@ async def scenario_agent_error(payload: Dict[str, Any]):
     minutes = payload.get("minutes", 1)
     
     # Set Explorator to error state
-    from datetime import datetime, timedelta
     retry_time = datetime.now(PHOENIX_TZ) + timedelta(minutes=minutes)
     
     # Find Explorator agent first
@@ -895,15 +1210,7 @@ class ProspectCreate(BaseModel):
 
 @api.get("/prospects")
 async def list_prospects():
-    docs = await COLL_ROLODEX.find().sort("updated_at", -1).to_list(500)
-    out = []
-    for d in docs:
-        d.pop("_id", None)
-        d.setdefault("handles", {})
-        d.setdefault("signals", [])
-        d.setdefault("source_type", "manual")
-        out.append(d)
-    return out
+    return await list_shaped(COLL_ROLODEX, {"handles": {}, "signals": [], "source_type": "manual"}, 500)
 
 @api.post("/prospects")
 async def create_prospect(payload: ProspectCreate):
@@ -949,13 +1256,7 @@ class HotLeadScriptUpdate(BaseModel):
 
 @api.get("/hotleads")
 async def list_hotleads():
-    docs = await COLL_HOT_LEADS.find().sort("updated_at", -1).to_list(200)
-    out = []
-    for d in docs:
-        d.pop("_id", None)
-        d.setdefault("evidence", [])
-        out.append(d)
-    return out
+    return await list_shaped(COLL_HOT_LEADS, {"evidence": []}, 200)
 
 @api.post("/hotleads")
 async def create_hotlead(payload: HotLeadCreate):
@@ -974,19 +1275,19 @@ async def get_hotlead(hotlead_id: str):
 
 @api.post("/hotleads/{hotlead_id}/status")
 async def update_hotlead_status(hotlead_id: str, payload: HotLeadStatusUpdate):
-    count = await update_by_id(COLL_HOT_LEADS, hotlead_id, {"status": payload.status})
-    if count == 0:
+    d = await update_and_get(COLL_HOT_LEADS, hotlead_id, {"status": payload.status})
+    if not d:
         raise HTTPException(status_code=404, detail="HotLead not found")
     await log_event("hotlead_status_updated", "backend/hotleads", {"hotlead_id": hotlead_id, "status": payload.status})
-    return await get_by_id(COLL_HOT_LEADS, hotlead_id)
+    return d
 
 @api.patch("/hotleads/{hotlead_id}")
 async def update_hotlead_script(hotlead_id: str, payload: HotLeadScriptUpdate):
-    count = await update_by_id(COLL_HOT_LEADS, hotlead_id, {"proposed_script": payload.proposed_script})
-    if count == 0:
+    d = await update_and_get(COLL_HOT_LEADS, hotlead_id, {"proposed_script": payload.proposed_script})
+    if not d:
         raise HTTPException(status_code=404, detail="HotLead not found")
     await log_event("hotlead_script_edited", "backend/hotleads", {"hotlead_id": hotlead_id})
-    return await get_by_id(COLL_HOT_LEADS, hotlead_id)
+    return d
 
 # Guardrails endpoints
 class Guardrail(BaseModel):
@@ -1020,15 +1321,7 @@ class GuardrailCreate(BaseModel):
 
 @api.get("/guardrails")
 async def list_guardrails():
-    docs = await COLL_GUARDRAILS.find().sort("updated_at", -1).to_list(200)
-    out = []
-    for d in docs:
-        d.pop("_id", None)
-        d.setdefault("scope", "global")
-        d.setdefault("sensitive_topics", [])
-        d.setdefault("standing_permissions", [])
-        out.append(d)
-    return out
+    return await list_shaped(COLL_GUARDRAILS, {"scope": "global", "sensitive_topics": [], "standing_permissions": []}, 200)
 
 @api.post("/guardrails")
 async def create_guardrail(payload: GuardrailCreate):
@@ -1069,13 +1362,7 @@ class ExportGenerate(BaseModel):
 
 @api.get("/exports")
 async def list_exports():
-    docs = await COLL_EXPORTS.find().sort("updated_at", -1).to_list(100)
-    out = []
-    for d in docs:
-        d.pop("_id", None)
-        d.setdefault("filter_spec", {})
-        out.append(d)
-    return out
+    return await list_shaped(COLL_EXPORTS, {"filter_spec": {}}, 100)
 
 @api.post("/exports/recipe")
 async def create_export_recipe(payload: ExportRecipeCreate):
@@ -1097,115 +1384,125 @@ async def generate_export(payload: ExportGenerate):
     # For now, just mark as complete with a mock file URL
     # In a real implementation, this would generate the actual export file
     file_url = f"/downloads/{recipe['_id']}.csv"
-    await update_by_id(COLL_EXPORTS, recipe["_id"], {
+    done = await update_and_get(COLL_EXPORTS, recipe["_id"], {
         "status": "complete",
         "file_url": file_url
     })
     
     await log_event("export_generated", "backend/exports", {"export_id": recipe["_id"], "recipe_name": payload.recipe_name})
-    return await get_by_id(COLL_EXPORTS, recipe["_id"])
+    return done
 
 # Praetoria Knowledge Base endpoint
-@api.get("/knowledge/praetoria")
-async def get_praetoria_knowledge():
-    """Comprehensive knowledge base about Praetoria for Augustus agents"""
-    return {
-        "company": "Praetoria",
-        "mission": "Visibility and control layer for the agent economy",
-        "tagline": "Unified command center for monitoring, validating, and coordinating autonomous AI agents",
-        
-        "evolution_stages": {
-            "stage_1": {
-                "name": "Agent Observability",
-                "status": "Live now",
-                "description": "Mission Control for live agent fleets",
-                "features": [
-                    "Real-time agent monitoring and status tracking",
-                    "Agent Trace Log & Replay for forensics-grade debugging", 
-                    "Organization Views with KPIs and alerts",
-                    "Error analysis with root-cause and fix suggestions",
-                    "Global agent index with performance metrics"
-                ]
-            },
-            "stage_2": {
-                "name": "Platform & Registry", 
-                "timeline": "2-4 months",
-                "description": "Registry of registries with verified agent identity",
-                "features": [
-                    "Unified Agent Index across all registries",
-                    "Praetoria Agent ID (PAID) canonical identity",
-                    "Claim & Verification with ownership proofs",
-                    "Reputation & History tracking",
-                    "Legal/Audit logging for compliance"
-                ]
-            },
-            "stage_3": {
-                "name": "Control Infrastructure",
-                "timeline": "6-12 months", 
-                "description": "Internet-grade routing, payments, and security",
-                "features": [
-                    "Behavior-aware Routing (Praetoria Relay)",
-                    "Agent-to-Agent Payments with escrow/metering",
-                    "Security & Threat Intelligence",
-                    "Agent firewalls and policy guards",
-                    "Premium reputation & compliance APIs"
-                ]
-            }
+# Comprehensive knowledge base about Praetoria for Augustus agents
+PRAETORIA_KNOWLEDGE = {
+    "company": "Praetoria",
+    "mission": "Visibility and control layer for the agent economy",
+    "tagline": "Unified command center for monitoring, validating, and coordinating autonomous AI agents",
+    
+    "evolution_stages": {
+        "stage_1": {
+            "name": "Agent Observability",
+            "status": "Live now",
+            "description": "Mission Control for live agent fleets",
+            "features": [
+                "Real-time agent monitoring and status tracking",
+                "Agent Trace Log & Replay for forensics-grade debugging", 
+                "Organization Views with KPIs and alerts",
+                "Error analysis with root-cause and fix suggestions",
+                "Global agent index with performance metrics"
+            ]
         },
-        
-        "target_personas": [
-            {
-                "name": "Developers/Agent Teams",
-                "pain_points": ["Lack of agent visibility", "Difficult debugging", "No trace replay"],
-                "value_props": ["Real-time observability", "Fast debugging", "Reproducible traces", "Verified identity path"]
-            },
-            {
-                "name": "Startups", 
-                "pain_points": ["No post-launch monitoring", "Building custom dashboards", "Investor visibility"],
-                "value_props": ["Ready-made monitoring", "Clear performance views", "Professional dashboards"]
-            },
-            {
-                "name": "Enterprises",
-                "pain_points": ["Multi-vendor agent chaos", "No governance", "Compliance gaps"],
-                "value_props": ["Unified visibility", "Governance controls", "Audit logs", "Risk scores"]
-            },
-            {
-                "name": "Security & Compliance",
-                "pain_points": ["Unknown agent behavior", "No policy enforcement", "Audit difficulties"],
-                "value_props": ["Anomaly detection", "Policy enforcement", "Provenance tracking", "Compliance logging"]
-            },
-            {
-                "name": "Investors & Analysts",
-                "pain_points": ["No agent economy visibility", "Market intelligence gaps"],
-                "value_props": ["Real-time market view", "Performance analytics", "Ecosystem insights"]
-            }
-        ],
-        
-        "competitive_advantages": [
-            "Built for agents, not generic apps or ML models",
-            "Captures prompt/response traces and multi-step reasoning",
-            "Framework-agnostic (LangChain, CrewAI, AutoGen, LangGraph, on-chain)",
-            "Privacy-by-design with tiered visibility",
-            "Evolution path: tool → platform → infrastructure",
-            "Agent-native routing, payments, and security"
-        ],
-        
-        "market_problems": [
-            "Agent proliferation without control towers",
-            "No shared identity or registry for agents", 
-            "Hard to verify ownership, provenance, performance",
-            "Need for agent-native routing, payments, security",
-            "Lack of interoperability and trust mechanisms"
-        ],
-        
-        "business_model": {
-            "stage_1": "SaaS subscription by org/agent with usage tiers",
-            "stage_2": "Registry fees, data intelligence APIs, compliance services", 
-            "stage_3": "Routing fees, reputation APIs, threat-intel subscriptions, verification tolls"
+        "stage_2": {
+            "name": "Platform & Registry", 
+            "timeline": "2-4 months",
+            "description": "Registry of registries with verified agent identity",
+            "features": [
+                "Unified Agent Index across all registries",
+                "Praetoria Agent ID (PAID) canonical identity",
+                "Claim & Verification with ownership proofs",
+                "Reputation & History tracking",
+                "Legal/Audit logging for compliance"
+            ]
         },
-        
-        "north_star": "As agents become first-class internet citizens, they need accountability, discovery, trust, and safe interoperation. Praetoria lays the rails for a resilient, thriving agent economy."
-    }
+        "stage_3": {
+            "name": "Control Infrastructure",
+            "timeline": "6-12 months", 
+            "description": "Internet-grade routing, payments, and security",
+            "features": [
+                "Behavior-aware Routing (Praetoria Relay)",
+                "Agent-to-Agent Payments with escrow/metering",
+                "Security & Threat Intelligence",
+                "Agent firewalls and policy guards",
+                "Premium reputation & compliance APIs"
+            ]
+        }
+    },
+    
+    "target_personas": [
+        {
+            "name": "Developers/Agent Teams",
+            "pain_points": ["Lack of agent visibility", "Difficult debugging", "No trace replay"],
+            "value_props": ["Real-time observability", "Fast debugging", "Reproducible traces", "Verified identity path"]
+        },
+        {
+            "name": "Startups", 
+            "pain_points": ["No post-launch monitoring", "Building custom dashboards", "Investor visibility"],
+            "value_props": ["Ready-made monitoring", "Clear performance views", "Professional dashboards"]
+        },
+        {
+            "name": "Enterprises",
+            "pain_points": ["Multi-vendor agent chaos", "No governance", "Compliance gaps"],
+            "value_props": ["Unified visibility", "Governance controls", "Audit logs", "Risk scores"]
+        },
+        {
+            "name": "Security & Compliance",
+            "pain_points": ["Unknown agent behavior", "No policy enforcement", "Audit difficulties"],
+            "value_props": ["Anomaly detection", "Policy enforcement", "Provenance tracking", "Compliance logging"]
+        },
+        {
+            "name": "Investors & Analysts",
+            "pain_points": ["No agent economy visibility", "Market intelligence gaps"],
+            "value_props": ["Real-time market view", "Performance analytics", "Ecosystem insights"]
+        }
+    ],
+    
+    "competitive_advantages": [
+        "Built for agents, not generic apps or ML models",
+        "Captures prompt/response traces and multi-step reasoning",
+        "Framework-agnostic (LangChain, CrewAI, AutoGen, LangGraph, on-chain)",
+        "Privacy-by-design with tiered visibility",
+        "Evolution path: tool → platform → infrastructure",
+        "Agent-native routing, payments, and security"
+    ],
+    
+    "market_problems": [
+        "Agent proliferation without control towers",
+        "No shared identity or registry for agents", 
+        "Hard to verify ownership, provenance, performance",
+        "Need for agent-native routing, payments, security",
+        "Lack of interoperability and trust mechanisms"
+    ],
+    
+    "business_model": {
+        "stage_1": "SaaS subscription by org/agent with usage tiers",
+        "stage_2": "Registry fees, data intelligence APIs, compliance services", 
+        "stage_3": "Routing fees, reputation APIs, threat-intel subscriptions, verification tolls"
+    },
+    
+    "north_star": "As agents become first-class internet citizens, they need accountability, discovery, trust, and safe interoperation. Praetoria lays the rails for a resilient, thriving agent economy."
+}
+
+# static payload: serialized and hashed once at import
+_PRAETORIA_KB_BYTES = orjson.dumps(PRAETORIA_KNOWLEDGE)
+_PRAETORIA_KB_ETAG = '"' + hashlib.sha1(_PRAETORIA_KB_BYTES).hexdigest() + '"'
+
+@api.get("/knowledge/praetoria")
+async def get_praetoria_knowledge(request: Request):
+    """Comprehensive knowledge base about Praetoria for Augustus agents"""
+    headers = {"ETag": _PRAETORIA_KB_ETAG}
+    if request.headers.get("if-none-match") == _PRAETORIA_KB_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=_PRAETORIA_KB_BYTES, media_type="application/json", headers=headers)
 
 # Basic health endpoints
 @api.get("/health")
@@ -1223,6 +1520,86 @@ from providers.routes import router as provider_router
 app.include_router(provider_router)
 app.include_router(api)
 
+async def ensure_indexes():
+    # Match each list endpoint's filter + sort so Mongo walks an index instead of sorting in memory.
+    # create_index is idempotent, so this is safe on every boot.
+    await asyncio.gather(
+        COLL_EVENTS.create_index([("source", 1), ("payload.campaign_id", 1), ("timestamp", -1)]),
+        COLL_EVENTS.create_index([("payload.thread_id", 1), ("timestamp", -1)]),
+        # single-filter and unfiltered shapes of list_events, which the compound above cannot sort for
+        COLL_EVENTS.create_index([("source", 1), ("timestamp", -1)]),
+        COLL_EVENTS.create_index([("payload.campaign_id", 1), ("timestamp", -1)]),
+        COLL_EVENTS.create_index([("timestamp", -1)]),
+        COLL_CAMPAIGNS.create_index([("updated_at", -1)]),
+        COLL_FORUMS.create_index([("updated_at", -1)]),
+        COLL_ROLODEX.create_index([("updated_at", -1)]),
+        COLL_HOT_LEADS.create_index([("updated_at", -1)]),
+        COLL_GUARDRAILS.create_index([("updated_at", -1)]),
+        COLL_EXPORTS.create_index([("updated_at", -1)]),
+        # list_agents' active research-mission check
+        COLL_CAMPAIGNS.create_index([("posture", 1), ("state", 1)]),
+        # agents are never listed by recency; seeding and the Explorator lookups go by name
+        COLL_AGENTS.create_index([("agent_name", 1)]),
+        COLL_FINDINGS.create_index([("campaign_id", 1), ("updated_at", -1)]),
+        COLL_MESSAGES.create_index([("thread_id", 1), ("created_at", -1)]),
+        COLL_THREADS.create_index([("campaign_id", 1), ("updated_at", -1)]),
+        # at most one General thread; user threads may still reuse any title
+        COLL_THREADS.create_index([("is_general", 1)], unique=True, partialFilterExpression={"is_general": True}),
+    )
+
+async def migrate_defaults():
+    # Backfill fields added after older documents were written, once per boot instead of on every read.
+    # One pipeline update per collection; it only matches documents missing a field, so reruns are cheap no-ops.
+    await asyncio.gather(*(
+        coll.update_many(
+            {"$or": [{k: {"$exists": False}} for k in defaults]},
+            [{"$set": fill_missing(defaults)}],
+        )
+        for coll, defaults in ((COLL_CAMPAIGNS, mission_defaults()), (COLL_FINDINGS, finding_defaults()))
+    ))
+    bump_version(COLL_CAMPAIGNS)
+
+async def mark_general_thread():
+    # General threads created before is_general existed: adopt one, unless a marked one is already there
+    if await COLL_THREADS.find_one({"is_general": True}, {"_id": 1}):
+        return
+    try:
+        await COLL_THREADS.update_one({"title": "General"}, {"$set": {"is_general": True}})
+    except DuplicateKeyError:
+        # another worker adopted one first
+        pass
+
+def start_event_worker():
+    global _event_worker
+    _event_worker = asyncio.create_task(_run_event_worker())
+
+def open_http_session():
+    # Shared keep-alive pool for outbound link checks instead of a session (and handshake) per call
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, limit_per_host=8, ttl_dns_cache=300, keepalive_timeout=75),
+        timeout=aiohttp.ClientTimeout(total=8),
+    )
+
+@app.on_event("startup")
+async def startup():
+    # One hook: start the in-process services, then run the independent index and backfill passes together
+    open_http_session()
+    start_event_worker()
+    await asyncio.gather(ensure_indexes(), migrate_defaults(), mark_general_thread())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await app.state.http.close()
+    if _event_worker:
+        # stop via the queue rather than cancel(), so a batch the worker already holds is still written
+        _event_queue.put_nowait(_EVENT_STOP)
+        await _event_worker
+    # flush anything logged after the stop marker before the connection goes away
+    while not _event_queue.empty():
+        await _flush_events(_drain_events([]))
+    client.close()
+
+if __name__ == "__main__":
+    import uvicorn
+    # Import by path so providers.routes shares this module's state; uvloop for a faster event loop
+    uvicorn.run("server:app", host="0.0.0.0", port=8001, loop="uvloop")
@@ -0,0 +1,10 @@
+import os
+import sys
+from pathlib import Path
+
+# server.py and the providers package import each other by top-level name, as when run from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+# server.py reads these at import; the Motor client connects lazily, so no database is needed
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "praetorian_test")
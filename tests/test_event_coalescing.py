@@ -0,0 +1,60 @@
+from server import _coalesce_events
+
+
+def event(name, payload, source="backend/mission_control", ts="2025-01-01T00:00:00.000000-07:00"):
+    return {"event_name": name, "source": source, "timestamp": ts, "payload": payload}
+
+
+def test_identical_payloads_collapse_into_first():
+    first = event("fe_error", {"thread_id": "t1", "message": "boom"})
+    repeat = event("fe_error", {"message": "boom", "thread_id": "t1"}, ts="2025-01-01T00:00:01.000000-07:00")
+
+    out = _coalesce_events([first, repeat])
+
+    assert out == [first]
+    assert out[0]["coalesced"] == 2
+    assert out[0]["timestamp"] == "2025-01-01T00:00:00.000000-07:00"
+
+
+def test_distinct_payloads_are_all_kept():
+    batch = [
+        event("findings_created", {"campaign_id": "c1", "finding_id": "f1"}),
+        event("findings_created", {"campaign_id": "c1", "finding_id": "f2"}),
+        event("run_controls_used", {"campaign_id": "c1", "action": "pause"}),
+        event("run_controls_used", {"campaign_id": "c1", "action": "abort"}),
+    ]
+
+    out = _coalesce_events([dict(e, payload=dict(e["payload"])) for e in batch])
+
+    assert [e["payload"] for e in out] == [e["payload"] for e in batch]
+    assert all("coalesced" not in e for e in out)
+
+
+def test_same_payload_under_different_event_or_source_is_kept():
+    payload = {"campaign_id": "c1"}
+    batch = [event("mission_started", payload), event("mission_paused", payload), event("mission_started", payload, source="frontend")]
+
+    assert len(_coalesce_events(batch)) == 3
+
+
+def test_events_without_a_reference_are_never_merged():
+    batch = [event("fe_click", {"button": "save"}), event("fe_click", {"button": "save"})]
+
+    out = _coalesce_events(batch)
+
+    assert len(out) == 2
+    assert all("coalesced" not in e for e in out)
+
+
+def test_non_dict_fe_payloads_pass_through():
+    batch = [event("fe_error", "plain string"), event("fe_error", ["a", "b"]), event("fe_error", None), event("fe_error", "plain string")]
+
+    out = _coalesce_events(batch)
+
+    assert [e["payload"] for e in out] == ["plain string", ["a", "b"], None, "plain string"]
+
+
+def test_non_string_reference_passes_through():
+    batch = [event("fe_error", {"thread_id": 42}), event("fe_error", {"thread_id": 42})]
+
+    assert len(_coalesce_events(batch)) == 2
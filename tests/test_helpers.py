@@ -0,0 +1,28 @@
+from server import fill_missing, to_phoenix
+
+
+def test_to_phoenix_returns_canonical_phoenix_strings_unchanged():
+    for ts in ("2025-03-04T05:06:07-07:00", "2025-03-04T05:06:07.123000-07:00"):
+        assert to_phoenix(ts) is ts
+
+
+def test_to_phoenix_converts_utc_and_naive_timestamps():
+    assert to_phoenix("2025-03-04T12:00:00Z") == "2025-03-04T05:00:00-07:00"
+    assert to_phoenix("2025-03-04T12:00:00") == "2025-03-04T05:00:00-07:00"
+
+
+def test_to_phoenix_passes_empty_values_through():
+    assert to_phoenix(None) is None
+    assert to_phoenix("") == ""
+
+
+def test_to_phoenix_falls_back_to_now_for_unparseable_values():
+    for bad in ("not a timestamp", 1700000000):
+        assert to_phoenix(bad).endswith("-07:00")
+
+
+def test_fill_missing_only_fills_absent_fields_with_literal_defaults():
+    spec = fill_missing({"topic_tags": [], "scope": "global"})
+
+    assert spec["topic_tags"] == {"$cond": [{"$eq": [{"$type": "$topic_tags"}, "missing"]}, {"$literal": []}, "$topic_tags"]}
+    assert spec["scope"]["$cond"][1] == {"$literal": "global"}
@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+import orjson
+
+from providers.openai_client import OpenAIClient
+
+
+def ok_row(i, text):
+    return {
+        "custom_id": f"req-{i}",
+        "response": {
+            "status_code": 200,
+            "body": {"model": "gpt-5", "choices": [{"message": {"content": text}}], "usage": {"prompt_tokens": 3, "completion_tokens": 5}},
+        },
+    }
+
+
+def error_row(i, message):
+    return {"custom_id": f"req-{i}", "response": None, "error": {"code": "server_error", "message": message}}
+
+
+class FakeOpenAI:
+    def __init__(self, batch, files):
+        self._batch = batch
+        self._files = files
+        self.batches = SimpleNamespace(retrieve=self._retrieve)
+        self.files = SimpleNamespace(content=self._content)
+
+    async def _retrieve(self, batch_id):
+        return self._batch
+
+    async def _content(self, file_id):
+        data = b"\n".join(orjson.dumps(r) for r in self._files[file_id])
+        return SimpleNamespace(read=lambda: data)
+
+
+def fetch(status="completed", output=None, errors=None, metadata=None, request_counts=None):
+    files = {}
+    if output is not None:
+        files["out"] = output
+    if errors is not None:
+        files["err"] = errors
+    batch = SimpleNamespace(
+        status=status,
+        output_file_id="out" if output is not None else None,
+        error_file_id="err" if errors is not None else None,
+        metadata=metadata,
+        request_counts=request_counts,
+    )
+    client = OpenAIClient.__new__(OpenAIClient)
+    client._client = FakeOpenAI(batch, files)
+    return asyncio.run(client.fetch_batch("batch_1"))
+
+
+def test_mixed_success_and_errors_keep_submission_slots():
+    res = fetch(
+        output=[ok_row(2, "third"), ok_row(0, "first")],
+        errors=[error_row(1, "rate limited")],
+        metadata={"request_count": "4"},
+    )
+
+    assert [r and r["text"] for r in res["results"]] == ["first", None, "third", None]
+    assert res["results"][0]["tokens_in"] == 3
+    assert res["errors"] == [{"index": 1, "custom_id": "req-1", "error": "rate limited"}]
+
+
+def test_non_200_output_rows_are_reported_as_errors():
+    bad = {"custom_id": "req-0", "response": {"status_code": 400, "body": {"error": {"message": "bad request"}}}}
+
+    res = fetch(output=[bad, ok_row(1, "fine")], metadata={"request_count": "2"})
+
+    assert res["results"][0] is None
+    assert res["results"][1]["text"] == "fine"
+    assert res["errors"] == [{"index": 0, "custom_id": "req-0", "error": "bad request"}]
+
+
+def test_every_request_failed_keeps_one_slot_per_submission():
+    res = fetch(errors=[error_row(0, "a"), error_row(2, "c"), error_row(1, "b")], metadata={"request_count": "3"})
+
+    assert res["results"] == [None, None, None]
+    assert [e["index"] for e in res["errors"]] == [0, 1, 2]
+
+
+def test_missing_metadata_falls_back_to_request_counts():
+    res = fetch(output=[ok_row(0, "only")], request_counts=SimpleNamespace(total=3))
+
+    assert len(res["results"]) == 3
+    assert res["results"][0]["text"] == "only"
+
+
+def test_missing_metadata_and_counts_sizes_from_highest_index():
+    res = fetch(output=[ok_row(0, "a")], errors=[error_row(3, "late failure")])
+
+    assert len(res["results"]) == 4
+    assert res["results"][3] is None
+
+
+def test_partial_output_of_expired_batch_is_collected():
+    res = fetch(status="expired", output=[ok_row(0, "done")], metadata={"request_count": "2"})
+
+    assert res["status"] == "expired"
+    assert [r and r["text"] for r in res["results"]] == ["done", None]
+
+
+def test_unfinished_batch_has_no_results():
+    res = fetch(status="in_progress")
+
+    assert res == {"status": "in_progress", "results": None, "errors": []}